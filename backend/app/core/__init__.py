@@ -8,7 +8,7 @@ from .exceptions import (
     ValidationException,
     ServiceUnavailableException
 )
-from .responses import APIResponse, PaginatedResponse
+from .responses import APIResponse, PaginatedResponse, ORJSONResponse
 
 __all__ = [
     "get_logger",
@@ -21,5 +21,6 @@ __all__ = [
     "ValidationException",
     "ServiceUnavailableException",
     "APIResponse",
-    "PaginatedResponse"
+    "PaginatedResponse",
+    "ORJSONResponse"
 ]
@@ -1,27 +1,125 @@
 """
 In-memory caching for PCBuild Assist API.
-Provides TTL-based caching for expensive operations.
+Provides TTL-based caching for expensive operations, with TinyLFU admission
+so one-off lookups don't evict frequently requested entries.
+
+When REDIS_URL is set, the async `aget`/`aset` API also reads through to a
+shared Redis cache (L2), so workers and restarts reuse each other's results.
+Values are stored there as JSON, compressed once they pass a size threshold.
 """
 from functools import wraps
-from typing import Optional, Any, Callable
-import hashlib
-import json
+from typing import Optional, Any, Awaitable, Callable, Dict, List
+import asyncio
 import os
-from cachetools import TTLCache
-from threading import Lock
+import pickle
+import zlib
+import orjson
+import xxhash
+from threading import Event, Lock
+
+from .tinylfu import ShardedTinyLFUCache
+from .logging import get_logger
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is optional; without it only the in-process cache is used
+    aioredis = None
+    RedisError = OSError
+
+try:
+    import zstandard
+except ImportError:  # Optional; Redis values fall back to zlib compression
+    zstandard = None
+
+logger = get_logger(__name__)
 
 # Cache configuration
 DEFAULT_TTL = int(os.getenv("CACHE_TTL_SECONDS", 300))  # 5 minutes default
 MAX_CACHE_SIZE = int(os.getenv("CACHE_MAX_SIZE", 1000))
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "pcbuild:cache:")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT_SECONDS", 0.25))
+REDIS_COMPRESS_MIN_BYTES = int(os.getenv("REDIS_COMPRESS_MIN_BYTES", 1024))
+
+# One-byte codec tags for compressed Redis values. JSON text never starts
+# with these bytes, so untagged values are plain JSON.
+_ZLIB_TAG = b"\x01"
+_ZSTD_TAG = b"\x02"
 
-# Thread-safe caches for different data types
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+
+# Thread-safe caches for different data types (sharded, each shard with its own lock)
 _caches = {
-    "search": TTLCache(maxsize=MAX_CACHE_SIZE, ttl=DEFAULT_TTL),
-    "components": TTLCache(maxsize=MAX_CACHE_SIZE * 2, ttl=DEFAULT_TTL * 2),  # Longer TTL for components
-    "facets": TTLCache(maxsize=100, ttl=DEFAULT_TTL * 6),  # 30 min for facets
-    "suggestions": TTLCache(maxsize=MAX_CACHE_SIZE, ttl=DEFAULT_TTL),
+    "search": ShardedTinyLFUCache(maxsize=MAX_CACHE_SIZE, ttl=DEFAULT_TTL),
+    "components": ShardedTinyLFUCache(maxsize=MAX_CACHE_SIZE * 2, ttl=DEFAULT_TTL * 2),  # Longer TTL for components
+    "facets": ShardedTinyLFUCache(maxsize=100, ttl=DEFAULT_TTL * 6),  # 30 min for facets
+    "popular": ShardedTinyLFUCache(maxsize=100, ttl=DEFAULT_TTL * 2),
+    "suggestions": ShardedTinyLFUCache(maxsize=MAX_CACHE_SIZE, ttl=DEFAULT_TTL),
+    "presets": ShardedTinyLFUCache(maxsize=100, ttl=DEFAULT_TTL * 12),  # 1 hour; presets are fixed
+    "compat_pair": ShardedTinyLFUCache(maxsize=MAX_CACHE_SIZE * 2, ttl=DEFAULT_TTL * 2),
+    "compat_build": ShardedTinyLFUCache(maxsize=MAX_CACHE_SIZE, ttl=DEFAULT_TTL * 2),
 }
-_locks = {key: Lock() for key in _caches}
+
+# Shared L2 cache; connections are opened lazily on first use
+_redis = (
+    aioredis.from_url(REDIS_URL, socket_timeout=REDIS_TIMEOUT, socket_connect_timeout=REDIS_TIMEOUT)
+    if aioredis is not None and REDIS_URL
+    else None
+)
+
+# In-flight cache misses, keyed by (cache_name, key). Guarded by striped locks
+# so concurrent misses on different keys don't contend on a single lock.
+_INFLIGHT_STRIPES = 64
+_inflight_locks = [Lock() for _ in range(_INFLIGHT_STRIPES)]
+_inflight: dict = {}
+_inflight_async: dict = {}
+
+
+def _inflight_lock(flight_key: tuple) -> Lock:
+    """Get the stripe lock guarding an in-flight entry."""
+    return _inflight_locks[hash(flight_key) & (_INFLIGHT_STRIPES - 1)]
+
+
+class _Flight:
+    """A cache miss being computed by one thread while others wait on it."""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = Event()
+        self.result = None
+        self.error = None
+
+
+def _encode_l2(value: Any) -> bytes:
+    """Serialize a value for Redis, compressing it if it's large."""
+    raw = orjson.dumps(value)
+    if len(raw) < REDIS_COMPRESS_MIN_BYTES:
+        return raw
+    if zstandard is not None:
+        return _ZSTD_TAG + _zstd_compressor.compress(raw)
+    return _ZLIB_TAG + zlib.compress(raw, 1)
+
+
+def _decode_l2(raw: bytes) -> Any:
+    """Inverse of `_encode_l2`. Raises ValueError for unreadable values."""
+    tag = raw[:1]
+    try:
+        if tag == _ZSTD_TAG:
+            if zstandard is None:
+                raise ValueError("zstd-compressed value but zstandard is not installed")
+            raw = _zstd_decompressor.decompress(raw[1:])
+        elif tag == _ZLIB_TAG:
+            raw = zlib.decompress(raw[1:])
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+    except Exception as e:
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise ValueError(str(e)) from e
+        raise
+    return orjson.loads(raw)
 
 
 class CacheManager:
@@ -30,12 +128,13 @@ class CacheManager:
     @staticmethod
     def _make_key(*args, **kwargs) -> str:
         """Generate a cache key from function arguments."""
-        key_data = {
-            "args": args,
-            "kwargs": {k: v for k, v in sorted(kwargs.items())}
-        }
-        key_string = json.dumps(key_data, sort_keys=True, default=str)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        key_data = (args, tuple(sorted(kwargs.items())))
+        try:
+            key_bytes = pickle.dumps(key_data, protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable arguments (clients, requests, ...) fall back to repr
+            key_bytes = repr(key_data).encode()
+        return xxhash.xxh3_128_hexdigest(key_bytes)
     
     @classmethod
     def get(cls, cache_name: str, key: str) -> Optional[Any]:
@@ -43,9 +142,16 @@ class CacheManager:
         cache = _caches.get(cache_name)
         if cache is None:
             return None
-        
-        with _locks[cache_name]:
-            return cache.get(key)
+
+        # Lock-free: reads are single dict lookups (atomic under the GIL) and
+        # never reorder entries, so a racing write at worst yields a stale miss
+        return cache.get(key)
+    
+    @classmethod
+    def ttl(cls, cache_name: str) -> int:
+        """Entry lifetime of a cache in seconds (0 if it doesn't exist)."""
+        cache = _caches.get(cache_name)
+        return int(cache.ttl) if cache is not None else 0
     
     @classmethod
     def set(cls, cache_name: str, key: str, value: Any) -> None:
@@ -54,8 +160,7 @@ class CacheManager:
         if cache is None:
             return
         
-        with _locks[cache_name]:
-            cache[key] = value
+        cache[key] = value
     
     @classmethod
     def delete(cls, cache_name: str, key: str) -> None:
@@ -64,40 +169,199 @@ class CacheManager:
         if cache is None:
             return
         
-        with _locks[cache_name]:
-            cache.pop(key, None)
+        cache.pop(key, None)
     
     @classmethod
     def clear(cls, cache_name: Optional[str] = None) -> None:
         """Clear a specific cache or all caches."""
         if cache_name:
             cache = _caches.get(cache_name)
-            if cache:
-                with _locks[cache_name]:
-                    cache.clear()
+            if cache is not None:
+                cache.clear()
         else:
-            for name, cache in _caches.items():
-                with _locks[name]:
-                    cache.clear()
+            for cache in _caches.values():
+                cache.clear()
+    
+    @staticmethod
+    def _l2_key(cache_name: str, key: str) -> str:
+        """Namespaced Redis key for an entry."""
+        return f"{REDIS_KEY_PREFIX}{cache_name}:{key}"
+    
+    @classmethod
+    def l2_enabled(cls) -> bool:
+        """Whether a Redis L2 cache is configured."""
+        return _redis is not None
+    
+    @classmethod
+    async def aget(cls, cache_name: str, key: str) -> Optional[Any]:
+        """Get a value from the local cache, falling back to Redis."""
+        value = cls.get(cache_name, key)
+        if value is not None or _redis is None or cache_name not in _caches:
+            return value
+        
+        try:
+            raw = await _redis.get(cls._l2_key(cache_name, key))
+        except (RedisError, OSError) as e:
+            logger.warning("Redis cache read failed", data={"error": str(e)})
+            return None
+        if raw is None:
+            return None
+        
+        try:
+            value = _decode_l2(raw)
+        except ValueError as e:
+            logger.warning("Redis cache value unreadable", data={"error": str(e)})
+            return None
+        cls.set(cache_name, key, value)
+        return value
+    
+    @classmethod
+    async def aget_many(cls, cache_name: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values at once. Local misses are fetched from Redis
+        in a single MGET. Returns only the keys that were found.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = cls.get(cache_name, key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        if not missing or _redis is None or cache_name not in _caches:
+            return found
+        
+        try:
+            raws = await _redis.mget([cls._l2_key(cache_name, key) for key in missing])
+        except (RedisError, OSError) as e:
+            logger.warning("Redis cache read failed", data={"error": str(e)})
+            return found
+        for key, raw in zip(missing, raws):
+            if raw is None:
+                continue
+            try:
+                found[key] = value = _decode_l2(raw)
+            except ValueError as e:
+                logger.warning("Redis cache value unreadable", data={"error": str(e)})
+                continue
+            cls.set(cache_name, key, value)
+        return found
+    
+    @classmethod
+    async def aset(cls, cache_name: str, key: str, value: Any) -> None:
+        """Set a value in the local cache and in Redis."""
+        cache = _caches.get(cache_name)
+        if cache is None:
+            return
+        
+        cache[key] = value
+        if _redis is None:
+            return
+        try:
+            await _redis.set(cls._l2_key(cache_name, key), _encode_l2(value), ex=int(cache.ttl))
+        except (RedisError, OSError, TypeError) as e:
+            logger.warning("Redis cache write failed", data={"error": str(e)})
+    
+    @classmethod
+    async def aset_many(cls, cache_name: str, items: Dict[str, Any]) -> None:
+        """Set several values, writing them to Redis in one pipeline."""
+        cache = _caches.get(cache_name)
+        if cache is None:
+            return
+        
+        for key, value in items.items():
+            cache[key] = value
+        if _redis is None or not items:
+            return
+        try:
+            async with _redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(cls._l2_key(cache_name, key), _encode_l2(value), ex=int(cache.ttl))
+                await pipe.execute()
+        except (RedisError, OSError, TypeError) as e:
+            logger.warning("Redis cache write failed", data={"error": str(e)})
+    
+    @classmethod
+    async def aclear(cls, cache_name: Optional[str] = None) -> None:
+        """Clear a specific cache or all caches, locally and in Redis."""
+        cls.clear(cache_name)
+        if _redis is None:
+            return
+        
+        pattern = cls._l2_key(cache_name or "*", "*")
+        try:
+            batch = []
+            async for redis_key in _redis.scan_iter(match=pattern, count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    await _redis.delete(*batch)
+                    batch = []
+            if batch:
+                await _redis.delete(*batch)
+        except (RedisError, OSError) as e:
+            logger.warning("Redis cache clear failed", data={"error": str(e)})
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the Redis connection pool, if any."""
+        if _redis is not None:
+            await _redis.aclose()
+    
+    @classmethod
+    def expire(cls) -> int:
+        """Sweep expired entries from all caches. Returns the number removed."""
+        return sum(cache.expire() for cache in _caches.values())
     
     @classmethod
     def stats(cls) -> dict:
         """Get cache statistics."""
-        return {
-            name: {
+        stats = {}
+        for name, cache in _caches.items():
+            hits, misses = cache.hits, cache.misses
+            lookups = hits + misses
+            stats[name] = {
                 "size": len(cache),
                 "max_size": cache.maxsize,
                 "ttl": cache.ttl,
-                "hits": getattr(cache, '_hits', 0),
+                "hits": hits,
+                "misses": misses,
+                "evictions": cache.evictions,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
             }
-            for name, cache in _caches.items()
-        }
+        return stats
 
 
 # Convenience instance
 cache = CacheManager()
 
 
+async def run_expiry(interval: float = 1.0) -> None:
+    """
+    Periodically sweep expired cache entries.
+    Run as a background task for the lifetime of the app.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        cache.expire()
+
+
+def _call_key(key_prefix: str, args: tuple, kwargs: dict) -> Any:
+    """
+    Build the cache key for a decorated call.
+    
+    Hashable arguments (ids, strings, numbers) are used as the key directly;
+    only unhashable payloads like dicts and lists go through `_make_key`.
+    """
+    key = (key_prefix, args, tuple(sorted(kwargs.items()))) if kwargs else (key_prefix, args)
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        digest = cache._make_key(*args, **kwargs)
+        return f"{key_prefix}:{digest}" if key_prefix else digest
+
+
 def cached(cache_name: str = "search", key_prefix: str = ""):
     """
     Decorator for caching function results.
@@ -115,19 +379,42 @@ def cached(cache_name: str = "search", key_prefix: str = ""):
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            key = f"{key_prefix}:{cache._make_key(*args, **kwargs)}" if key_prefix else cache._make_key(*args, **kwargs)
+            key = _call_key(key_prefix, args, kwargs)
             
             # Try to get from cache
             cached_value = cache.get(cache_name, key)
             if cached_value is not None:
                 return cached_value
             
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            if result is not None:
-                cache.set(cache_name, key, result)
+            # Only one caller computes a given miss; the rest wait for its result
+            flight_key = (cache_name, key)
+            lock = _inflight_lock(flight_key)
+            with lock:
+                flight = _inflight.get(flight_key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = _inflight[flight_key] = _Flight()
             
-            return result
+            if not is_leader:
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            
+            # Call function and cache result
+            try:
+                result = func(*args, **kwargs)
+                if result is not None:
+                    cache.set(cache_name, key, result)
+                flight.result = result
+                return result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with lock:
+                    _inflight.pop(flight_key, None)
+                flight.event.set()
         
         # Add cache bypass method
         wrapper.uncached = func
@@ -137,6 +424,37 @@ def cached(cache_name: str = "search", key_prefix: str = ""):
     return decorator
 
 
+async def single_flight(cache_name: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await `loader()` for a cache miss, sharing the call with every coroutine
+    that misses on the same key meanwhile. The result isn't stored; callers
+    cache it themselves.
+    
+    Example:
+        component = await single_flight("components", key, lambda: fetch(component_id))
+    """
+    # The first coroutine starts the miss as its own task; everyone (the starter
+    # included) awaits it shielded, so a cancelled caller doesn't cancel the
+    # shared load for the others
+    flight_key = (cache_name, key)
+    with _inflight_lock(flight_key):
+        task = _inflight_async.get(flight_key)
+        if task is None:
+            task = _inflight_async[flight_key] = asyncio.ensure_future(loader())
+            task.add_done_callback(lambda done: _end_flight(flight_key, done))
+    
+    return await asyncio.shield(task)
+
+
+def _end_flight(flight_key: tuple, task: asyncio.Future) -> None:
+    """Forget a finished `single_flight` load."""
+    with _inflight_lock(flight_key):
+        if _inflight_async.get(flight_key) is task:
+            del _inflight_async[flight_key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved when nobody is waiting
+
+
 def cached_async(cache_name: str = "search", key_prefix: str = ""):
     """
     Decorator for caching async function results.
@@ -149,19 +467,21 @@ def cached_async(cache_name: str = "search", key_prefix: str = ""):
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Generate cache key
-            key = f"{key_prefix}:{cache._make_key(*args, **kwargs)}" if key_prefix else cache._make_key(*args, **kwargs)
+            key = _call_key(key_prefix, args, kwargs)
             
             # Try to get from cache
             cached_value = cache.get(cache_name, key)
             if cached_value is not None:
                 return cached_value
             
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            if result is not None:
-                cache.set(cache_name, key, result)
+            # Call function once per concurrent miss and cache result
+            async def load():
+                result = await func(*args, **kwargs)
+                if result is not None:
+                    cache.set(cache_name, key, result)
+                return result
             
-            return result
+            return await single_flight(cache_name, key, load)
         
         wrapper.uncached = func
         wrapper.cache_clear = lambda: cache.clear(cache_name)
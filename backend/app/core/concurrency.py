@@ -0,0 +1,122 @@
+"""
+Concurrency limiting for PCBuild Assist API.
+Caps in-flight requests per client on expensive endpoints, complementing the
+per-minute rate limits.
+"""
+from typing import AsyncIterator, Dict, Tuple
+import os
+import time
+
+from fastapi import Request
+
+from .exceptions import RateLimitException
+from .logging import get_logger
+from .rate_limit import get_client_ip
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is optional; without it slots are counted per process
+    aioredis = None
+    RedisError = OSError
+
+logger = get_logger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_KEY_PREFIX = os.getenv("CONCURRENCY_KEY_PREFIX", "pcbuild:inflight:")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT_SECONDS", 0.25))
+
+# Slots held longer than this are presumed leaked (e.g. a crashed worker) and reclaimed
+SLOT_TIMEOUT = float(os.getenv("CONCURRENCY_SLOT_TIMEOUT_SECONDS", 30))
+
+# Drop stale slots, then take one if fewer than ARGV[2] are held.
+# KEYS[1] = slot set; ARGV = now_ms, max_inflight, timeout_ms, member
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1] - ARGV[3])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Shared slot sets; connections are opened lazily on first use
+_redis = (
+    aioredis.from_url(REDIS_URL, socket_timeout=REDIS_TIMEOUT, socket_connect_timeout=REDIS_TIMEOUT)
+    if aioredis is not None and REDIS_URL
+    else None
+)
+_acquire = _redis.register_script(_ACQUIRE_SCRIPT) if _redis is not None else None
+
+# Per-process fallback: (name, client) -> in-flight count
+_local_inflight: Dict[Tuple[str, str], int] = {}
+
+
+class ConcurrencyLimit:
+    """
+    Dependency that holds one of `max_inflight` slots per client for the
+    duration of a request, answering 429 when none are free.
+
+    With REDIS_URL set, slots are members of a sorted set scored by start
+    time, so the limit is shared by every worker and leaked slots age out
+    after SLOT_TIMEOUT. Otherwise each process counts its own slots. If Redis
+    is unreachable the request is let through rather than failed.
+
+    Usage:
+        @router.get("/expensive", dependencies=[Depends(ConcurrencyLimit("expensive", 4))])
+    """
+
+    def __init__(self, name: str, max_inflight: int):
+        self.name = name
+        self.max_inflight = max_inflight
+
+    async def __call__(self, request: Request) -> AsyncIterator[None]:
+        client = get_client_ip(request)
+        if _redis is None:
+            local_key = (self.name, client)
+            count = _local_inflight.get(local_key, 0)
+            if count >= self.max_inflight:
+                raise self._exceeded()
+            _local_inflight[local_key] = count + 1
+            try:
+                yield
+            finally:
+                remaining = _local_inflight[local_key] - 1
+                if remaining:
+                    _local_inflight[local_key] = remaining
+                else:
+                    del _local_inflight[local_key]
+            return
+
+        key = f"{REDIS_KEY_PREFIX}{self.name}:{client}"
+        member = os.urandom(4).hex()
+        try:
+            acquired = await _acquire(
+                keys=[key],
+                args=[int(time.time() * 1000), self.max_inflight, int(SLOT_TIMEOUT * 1000), member]
+            )
+        except RedisError as e:
+            logger.warning(f"Concurrency limiter unavailable for {self.name}: {e}")
+            yield
+            return
+
+        if not acquired:
+            raise self._exceeded()
+        try:
+            yield
+        finally:
+            try:
+                await _redis.zrem(key, member)
+            except RedisError as e:
+                # The slot ages out after SLOT_TIMEOUT
+                logger.warning(f"Failed to release concurrency slot for {self.name}: {e}")
+
+    def _exceeded(self) -> RateLimitException:
+        return RateLimitException(f"{self.max_inflight} concurrent {self.name} requests", retry_after=1)
+
+
+async def close() -> None:
+    """Close Redis connections."""
+    if _redis is not None:
+        await _redis.aclose()
@@ -23,13 +23,28 @@ class APIException(HTTPException):
         self.message = message
         self.details = details or {}
         
-        detail = {
-            "code": code,
-            "message": message,
-            "details": self.details
-        }
-        
-        super().__init__(status_code=status_code, detail=detail, headers=headers)
+        super().__init__(status_code=status_code, headers=headers)
+        # HTTPException filled in the status phrase; build the real detail on first access
+        self._detail = None
+    
+    @property
+    def detail(self) -> Dict[str, Any]:
+        """
+        Structured error detail, built lazily.
+        Our exception handler reads code/message/details directly, so most
+        exceptions never need this dict.
+        """
+        if self._detail is None:
+            self._detail = {
+                "code": self.code,
+                "message": self.message,
+                "details": self.details
+            }
+        return self._detail
+    
+    @detail.setter
+    def detail(self, value: Any) -> None:
+        self._detail = value
 
 
 class NotFoundException(APIException):
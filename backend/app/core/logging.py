@@ -2,40 +2,76 @@
 Structured logging configuration for PCBuild Assist API.
 Provides JSON-formatted logs with request tracing.
 """
+import atexit
 import logging
+import queue
 import sys
 import os
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
-import uuid
+import random
+import time
+import orjson
 from contextvars import ContextVar
 
-# Context variable for request tracking
+from .timestamps import utc_timestamp
+
+# Context variables for request tracking
 request_id_ctx: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+request_start_ctx: ContextVar[Optional[int]] = ContextVar('request_start', default=None)
+
+
+# Environment is read once at import; these don't change for the life of the process
+ENVIRONMENT = os.getenv("ENV", "development")
+IS_PRODUCTION = ENVIRONMENT == "production"
+LOG_LEVEL = os.getenv("LOG_LEVEL")
+
+# Readable format for development: [timestamp] LEVEL | request | logger: message
+_DEV_FORMAT = "[{}] {:8} | {:8} | {}: {}{}".format
+
+# Records waiting to be formatted and written by the background listener.
+# Bounded so a stalled stdout can't grow memory without limit.
+LOG_QUEUE_SIZE = 10000
+_listener: Optional[QueueListener] = None
+
+
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args, **kwargs) -> logging.LogRecord:
+    """Stamp each record with the current request ID when it is created."""
+    record = _base_record_factory(*args, **kwargs)
+    record.request_id = request_id_ctx.get() or "no-request"
+    return record
 
 
 class RequestFormatter(logging.Formatter):
-    """Custom formatter that includes request ID and structured data."""
+    """
+    Custom formatter that includes request ID and structured data.
+    Expects records from `_record_factory` (installed by `setup_logging`).
+    """
     
     def format(self, record):
-        # Add request ID if available
-        record.request_id = request_id_ctx.get() or "no-request"
+        # Add timestamp in ISO format (from creation time, since formatting is deferred)
+        record.timestamp = utc_timestamp(record.created)
         
-        # Add timestamp in ISO format
-        record.timestamp = datetime.utcnow().isoformat() + "Z"
+        message = record.getMessage()
+        extra = getattr(record, 'extra_data', None)
         
-        # Format the message
-        if hasattr(record, 'extra_data'):
-            extra = record.extra_data
-        else:
-            extra = {}
+        # In production, output JSON; in dev, use readable format
+        if not IS_PRODUCTION:
+            extra_str = f" | {extra}" if extra else ""
+            return _DEV_FORMAT(
+                record.timestamp, record.levelname, record.request_id[:8],
+                record.name, message, extra_str
+            )
         
         # Build structured log
         log_data = {
             "timestamp": record.timestamp,
             "level": record.levelname,
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": message,
             "request_id": record.request_id,
             "module": record.module,
             "function": record.funcName,
@@ -48,14 +84,7 @@ class RequestFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        # In production, output JSON; in dev, use readable format
-        if os.getenv("ENV", "development") == "production":
-            import json
-            return json.dumps(log_data)
-        else:
-            # Readable format for development
-            extra_str = f" | {extra}" if extra else ""
-            return f"[{record.timestamp}] {record.levelname:8} | {record.request_id[:8]:8} | {record.name}: {record.getMessage()}{extra_str}"
+        return orjson.dumps(log_data, default=str).decode()
 
 
 class ContextLogger(logging.LoggerAdapter):
@@ -63,12 +92,33 @@ class ContextLogger(logging.LoggerAdapter):
     
     def process(self, msg, kwargs):
         # Add extra data if provided
-        extra = kwargs.get('extra', {})
-        extra['extra_data'] = kwargs.pop('data', {})
-        kwargs['extra'] = extra
+        if 'data' in kwargs:
+            extra = kwargs.get('extra') or {}
+            extra['extra_data'] = kwargs.pop('data')
+            kwargs['extra'] = extra
         return msg, kwargs
 
 
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that hands records to the listener thread untouched.
+    
+    The stdlib QueueHandler formats each record in the calling thread so it
+    can cross process boundaries; our queue is in-process, so formatting is
+    left to the listener and the request coroutine only pays for an enqueue.
+    Records are dropped if the queue is full rather than blocking.
+    """
+    
+    def prepare(self, record):
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
 def setup_logging(level: str = "INFO") -> None:
     """
     Setup logging configuration for the application.
@@ -77,7 +127,10 @@ def setup_logging(level: str = "INFO") -> None:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
     # Get log level from env or parameter
-    log_level = os.getenv("LOG_LEVEL", level).upper()
+    log_level = (LOG_LEVEL or level).upper()
+    
+    # Stamp request IDs on records at creation, where the request context is live
+    logging.setLogRecordFactory(_record_factory)
     
     # Create formatter
     formatter = RequestFormatter()
@@ -90,10 +143,19 @@ def setup_logging(level: str = "INFO") -> None:
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Add console handler
+    # Console output is formatted and written by a background listener thread
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = QueueListener(log_queue, console_handler)
+    _listener.start()
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
     
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -101,6 +163,12 @@ def setup_logging(level: str = "INFO") -> None:
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 
+def _stop_listener() -> None:
+    """Flush queued records on interpreter exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
 def get_logger(name: str) -> ContextLogger:
     """
     Get a logger instance with context support.
@@ -116,8 +184,14 @@ def get_logger(name: str) -> ContextLogger:
 
 
 def generate_request_id() -> str:
-    """Generate a unique request ID."""
-    return str(uuid.uuid4())
+    """
+    Generate a request ID: 64 random bits as 16 hex chars.
+    
+    Uses the module-level PRNG (reseeded after fork, so workers don't repeat
+    each other) rather than uuid4's urandom read. Fine for log correlation;
+    not suitable for anything security-sensitive.
+    """
+    return f"{random.getrandbits(64):016x}"
 
 
 def set_request_id(request_id: str) -> None:
@@ -128,3 +202,21 @@ def set_request_id(request_id: str) -> None:
 def get_request_id() -> Optional[str]:
     """Get the current request ID from context."""
     return request_id_ctx.get()
+
+
+def set_request_start(start_ns: int) -> None:
+    """Set the current request's start time (a `time.perf_counter_ns()` reading)."""
+    request_start_ctx.set(start_ns)
+
+
+def elapsed_ms(start_ns: int) -> int:
+    """Whole milliseconds (rounded) since a `time.perf_counter_ns()` reading."""
+    return (time.perf_counter_ns() - start_ns + 500_000) // 1_000_000
+
+
+def get_request_elapsed_ms() -> Optional[int]:
+    """Milliseconds since the current request started, or None outside a request."""
+    start_ns = request_start_ctx.get()
+    if start_ns is None:
+        return None
+    return elapsed_ms(start_ns)
@@ -4,47 +4,65 @@ Prevents abuse and ensures fair usage.
 """
 import os
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request
-from fastapi.responses import JSONResponse
+
+from .responses import ORJSONResponse
+
+# Registers the sharded-memory:// storage scheme
+from . import rate_limit_storage  # noqa: F401
 
 # Rate limit configuration
 DEFAULT_RATE_LIMIT = os.getenv("RATE_LIMIT", "100/minute")
 SEARCH_RATE_LIMIT = os.getenv("SEARCH_RATE_LIMIT", "30/minute")
 HEAVY_RATE_LIMIT = os.getenv("HEAVY_RATE_LIMIT", "10/minute")
 
+# Counters live in Redis when one is configured, so every worker shares the same
+# limits; otherwise each process keeps its own in sharded memory
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI") or os.getenv("REDIS_URL") or "sharded-memory://"
+
+
+# Header names pre-lowercased to match Starlette's normalized header keys
+_FORWARDED_FOR = "x-forwarded-for"
+_REAL_IP = "x-real-ip"
+
 
 def get_client_ip(request: Request) -> str:
     """
     Get client IP address, considering proxies.
     """
+    headers = request.headers
+    
     # Check for forwarded header (when behind a proxy)
-    forwarded = request.headers.get("X-Forwarded-For")
+    forwarded = headers.get(_FORWARDED_FOR)
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
     
-    real_ip = request.headers.get("X-Real-IP")
+    real_ip = headers.get(_REAL_IP)
     if real_ip:
         return real_ip
     
-    return get_remote_address(request)
+    # Same as slowapi's get_remote_address, without the Request.client wrapper
+    client = request.scope.get("client")
+    return client[0] if client else "127.0.0.1"
 
 
 # Create limiter instance
 limiter = Limiter(
     key_func=get_client_ip,
     default_limits=[DEFAULT_RATE_LIMIT],
-    storage_uri="memory://",
-    strategy="fixed-window"
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+    # Keep limiting per process if Redis becomes unreachable
+    in_memory_fallback_enabled=RATE_LIMIT_STORAGE_URI != "sharded-memory://"
 )
 
 
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> ORJSONResponse:
     """
     Custom handler for rate limit exceeded errors.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=429,
         content={
             "success": False,
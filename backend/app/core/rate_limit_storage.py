@@ -0,0 +1,145 @@
+"""
+In-process rate limit storage for PCBuild Assist API.
+Fixed-window and sliding-window counters split across independently locked shards.
+"""
+from threading import Lock
+from typing import Dict, List, Tuple
+import math
+import time
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+# Number of shards (power of two so the shard index is a mask)
+SHARD_COUNT = 64
+
+# Expired counters are swept from a shard once it grows past this size
+SWEEP_THRESHOLD = 1024
+
+
+class ShardedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Fixed-window and sliding-window-counter storage registered as ``sharded-memory://``.
+
+    Each shard is a plain dict of ``key -> (count, expires_at)`` guarded by its
+    own lock, so increments for different clients rarely contend. Reads are
+    single dict lookups and take no lock. Unlike ``memory://`` there is no
+    background expiry timer; expired windows reset on the next increment and
+    are swept lazily.
+    """
+
+    STORAGE_SCHEME = ["sharded-memory"]
+
+    def __init__(self, uri: str = None, wrap_exceptions: bool = False, **options):
+        self._shards: List[Tuple[Dict[str, Tuple[int, float]], Lock]] = [
+            ({}, Lock()) for _ in range(SHARD_COUNT)
+        ]
+        # Sliding windows as key -> (previous_count, current_count, window_start, stale_at),
+        # sharing the counter shards' locks
+        self._windows: List[Dict[str, Tuple[int, int, float, float]]] = [{} for _ in range(SHARD_COUNT)]
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def _shard(self, key: str) -> Tuple[Dict[str, Tuple[int, float]], Lock]:
+        return self._shards[hash(key) & (SHARD_COUNT - 1)]
+
+    @staticmethod
+    def _current_window(entry: Tuple[int, int, float, float], expiry: int, now: float) -> Tuple[int, int, float]:
+        """Roll a window entry forward to the window containing `now`."""
+        window_start = math.floor(now / expiry) * expiry
+        if entry is None or entry[3] <= now:
+            return 0, 0, window_start
+        previous, current, start = entry[0], entry[1], entry[2]
+        if start == window_start:
+            return previous, current, start
+        # One window later the current count becomes the previous one; any later and both are stale
+        return (current if start + expiry == window_start else 0), 0, window_start
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        index = hash(key) & (SHARD_COUNT - 1)
+        windows, lock = self._windows[index], self._shards[index][1]
+        now = time.time()
+
+        with lock:
+            entry = windows.get(key)
+            if entry is None and len(windows) >= SWEEP_THRESHOLD:
+                self._sweep_windows(windows, now)
+            previous, current, window_start = self._current_window(entry, expiry, now)
+            previous_ttl = window_start + expiry - now
+            if math.floor(previous * previous_ttl / expiry + current) + amount > limit:
+                return False
+            windows[key] = (previous, current + amount, window_start, window_start + 2 * expiry)
+
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        entry = self._windows[hash(key) & (SHARD_COUNT - 1)].get(key)
+        previous, current, window_start = self._current_window(entry, expiry, now)
+        return previous, window_start + expiry - now, current, window_start + 2 * expiry - now
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        counters, lock = self._shard(key)
+        now = time.time()
+
+        with lock:
+            entry = counters.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is None and len(counters) >= SWEEP_THRESHOLD:
+                    self._sweep(counters, now)
+                count, expires_at = amount, now + expiry
+            else:
+                count, expires_at = entry[0] + amount, entry[1]
+            counters[key] = (count, expires_at)
+
+        return count
+
+    def get(self, key: str) -> int:
+        entry = self._shard(key)[0].get(key)
+        if entry is None or entry[1] <= time.time():
+            return 0
+        return entry[0]
+
+    def get_expiry(self, key: str) -> float:
+        entry = self._shard(key)[0].get(key)
+        return entry[1] if entry is not None else time.time()
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int:
+        cleared = 0
+        for (counters, lock), windows in zip(self._shards, self._windows):
+            with lock:
+                cleared += len(counters) + len(windows)
+                counters.clear()
+                windows.clear()
+        return cleared
+
+    def clear(self, key: str) -> None:
+        index = hash(key) & (SHARD_COUNT - 1)
+        counters, lock = self._shards[index]
+        with lock:
+            counters.pop(key, None)
+            self._windows[index].pop(key, None)
+
+    @staticmethod
+    def _sweep(counters: Dict[str, Tuple[int, float]], now: float) -> None:
+        """Drop expired windows. Caller must hold the shard lock."""
+        expired = [key for key, (_, expires_at) in counters.items() if expires_at <= now]
+        for key in expired:
+            del counters[key]
+
+    @staticmethod
+    def _sweep_windows(windows: Dict[str, Tuple[int, int, float, float]], now: float) -> None:
+        """Drop windows too old to affect the weighted count. Caller must hold the shard lock."""
+        stale = [key for key, entry in windows.items() if entry[3] <= now]
+        for key in stale:
+            del windows[key]
@@ -3,17 +3,35 @@ Standardized API response models for PCBuild Assist API.
 Ensures consistent response format across all endpoints.
 """
 from typing import TypeVar, Generic, Optional, List, Any, Dict
-from pydantic import BaseModel, Field
-from datetime import datetime
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+import hashlib
+import orjson
+
+from .logging import get_request_elapsed_ms
+from .timestamps import utc_timestamp
 
 T = TypeVar('T')
 
+API_VERSION = "1.0.0"
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    Used as the app's default response class.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 
 class MetaData(BaseModel):
     """Response metadata."""
     request_id: Optional[str] = Field(None, description="Unique request identifier")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
-    version: str = Field(default="1.0.0", description="API version")
+    timestamp: str = Field(default_factory=utc_timestamp)
+    version: str = Field(default=API_VERSION, description="API version")
     processing_time_ms: Optional[int] = Field(None, description="Server processing time in milliseconds")
 
 
@@ -45,8 +63,8 @@ class APIResponse(BaseModel, Generic[T]):
     error: Optional[ErrorDetail] = Field(None, description="Error details if success=False")
     meta: MetaData = Field(default_factory=MetaData, description="Response metadata")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "data": {"id": "cpu_001", "name": "AMD Ryzen 9 9900X"},
@@ -59,6 +77,7 @@ class APIResponse(BaseModel, Generic[T]):
                 }
             }
         }
+    )
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -72,8 +91,8 @@ class PaginatedResponse(BaseModel, Generic[T]):
     error: Optional[ErrorDetail] = Field(None, description="Error details if success=False")
     meta: MetaData = Field(default_factory=MetaData, description="Response metadata")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "data": [{"id": "cpu_001", "name": "AMD Ryzen 9 9900X"}],
@@ -93,6 +112,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
                 }
             }
         }
+    )
 
 
 class SearchResponse(PaginatedResponse[T], Generic[T]):
@@ -111,16 +131,16 @@ def success_response(
     request_id: Optional[str] = None,
     processing_time_ms: Optional[int] = None
 ) -> dict:
-    """Create a success response dict."""
+    """Create a success response dict. Processing time defaults to time since the request started."""
     return {
         "success": True,
         "data": data,
         "error": None,
         "meta": {
             "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "version": "1.0.0",
-            "processing_time_ms": processing_time_ms
+            "timestamp": utc_timestamp(),
+            "version": API_VERSION,
+            "processing_time_ms": processing_time_ms if processing_time_ms is not None else get_request_elapsed_ms()
         }
     }
 
@@ -142,8 +162,8 @@ def error_response(
         },
         "meta": {
             "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "version": "1.0.0"
+            "timestamp": utc_timestamp(),
+            "version": API_VERSION
         }
     }
 
@@ -158,8 +178,8 @@ def paginated_response(
     query: Optional[str] = None,
     filters: Optional[Dict[str, Any]] = None
 ) -> dict:
-    """Create a paginated response dict."""
-    total_pages = (total_items + per_page - 1) // per_page if per_page > 0 else 0
+    """Create a paginated response dict. Processing time defaults to time since the request started."""
+    total_pages = -(-total_items // per_page) if per_page > 0 else 0
     
     response = {
         "success": True,
@@ -169,15 +189,15 @@ def paginated_response(
             "per_page": per_page,
             "total_items": total_items,
             "total_pages": total_pages,
-            "has_next": page < total_pages - 1,
+            "has_next": (page + 1) * per_page < total_items,
             "has_prev": page > 0
         },
         "error": None,
         "meta": {
             "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "version": "1.0.0",
-            "processing_time_ms": processing_time_ms
+            "timestamp": utc_timestamp(),
+            "version": API_VERSION,
+            "processing_time_ms": processing_time_ms if processing_time_ms is not None else get_request_elapsed_ms()
         }
     }
     
@@ -187,3 +207,47 @@ def paginated_response(
         response["filters_applied"] = filters
     
     return response
+
+
+def payload_etag(content: Any) -> str:
+    """Strong ETag for a JSON-compatible payload."""
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already holds `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def cacheable_response(
+    request: Request,
+    content: dict,
+    max_age: int,
+    etag: Optional[str] = None
+) -> Response:
+    """
+    Render a GET response with `Cache-Control` and `ETag` headers.
+
+    The ETag covers everything but `meta`, whose request id and timestamp
+    differ on every call. Pass a stored `etag` to skip hashing; when the
+    client already holds it, a bodyless 304 is returned instead.
+    """
+    headers = {"Cache-Control": f"public, max-age={max_age}"}
+    if etag is not None:
+        headers["ETag"] = etag
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+    content = jsonable_encoder(content)
+    if etag is None:
+        etag = headers["ETag"] = payload_etag({k: v for k, v in content.items() if k != "meta"})
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+    return ORJSONResponse(content, headers=headers)
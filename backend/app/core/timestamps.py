@@ -0,0 +1,34 @@
+"""
+Fast UTC timestamps for PCBuild Assist API.
+Used for response metadata and log records, which are stamped on every request.
+"""
+from typing import Optional
+import time
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for the last second seen.
+# Swapped as a single tuple so concurrent threads never see a torn pair.
+_second_cache = (-1, "")
+
+
+def utc_timestamp(epoch: Optional[float] = None) -> str:
+    """
+    UTC time as ISO-8601 with millisecond precision, e.g.
+    "2025-01-30T12:00:00.123Z".
+
+    Args:
+        epoch: Unix time in seconds (e.g. LogRecord.created); defaults to now
+
+    The date/time part is formatted once per second and reused.
+    """
+    global _second_cache
+    if epoch is None:
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        millis = nanos // 1_000_000
+    else:
+        seconds = int(epoch)
+        millis = int((epoch - seconds) * 1000)
+    cached_second, prefix = _second_cache
+    if seconds != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _second_cache = (seconds, prefix)
+    return f"{prefix}.{millis:03d}Z"
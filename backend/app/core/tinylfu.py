@@ -0,0 +1,259 @@
+"""
+Frequency-aware TTL cache for PCBuild Assist API.
+Implements a simplified W-TinyLFU admission policy on top of TTL expiry,
+plus a sharded, thread-safe wrapper.
+"""
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+import math
+import time
+
+# Frequency counters saturate at this value (4-bit, as in TinyLFU)
+MAX_FREQUENCY = 15
+
+# Smallest shard worth splitting off; smaller caches use fewer shards
+MIN_SHARD_SIZE = 64
+
+
+class TinyLFUCache:
+    """
+    TTL cache with a small admission window in front of a frequency-filtered
+    main segment.
+
+    New entries always land in the window. When the window overflows, its
+    oldest entry competes with the main segment's oldest entry and only
+    replaces it if it has been requested more often. One-off keys (scans,
+    typos, unique searches) therefore can't flush popular entries.
+
+    Reads never reorder entries, so a lookup is a plain dict access plus an
+    expiry check and is safe without a lock (frequency counting may lose an
+    increment under contention, which only nudges admission). Writes must be
+    serialized by the caller.
+
+    Expired entries are removed in batches by `expire()`: keys are bucketed by
+    the whole second they expire in (a coarse timer wheel), so a sweep only
+    touches keys that are actually due. Writes sweep at most once per second;
+    callers may also sweep periodically so idle caches release memory.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+
+        self._window_size = max(1, maxsize // 100)
+        self._main_size = max(1, maxsize - self._window_size)
+        self._window: Dict[Hashable, Tuple[Any, float]] = {}
+        self._main: Dict[Hashable, Tuple[Any, float]] = {}
+
+        # Access frequencies keyed by key hash, halved every `_sample_size` accesses
+        self._freq: Dict[int, int] = {}
+        self._sample_size = max(10 * maxsize, 100)
+        self._accesses = 0
+
+        # Lifetime counters; plain int increments, so concurrent readers may
+        # occasionally drop one, which is fine for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Whole second -> keys expiring just before it; ticks below `_next_tick` are swept
+        self._wheel: Dict[int, List[Hashable]] = {}
+        self._next_tick = math.floor(timer())
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._main.get(key) or self._window.get(key)
+        return item is not None and item[1] > self.timer()
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = self.timer()
+        if now >= self._next_tick:
+            self.expire(now)
+
+        expires_at = now + self.ttl
+        item = (value, expires_at)
+        self._record(key)
+        # Bucket by the first whole second after expiry so a due bucket holds only expired keys
+        self._wheel.setdefault(math.floor(expires_at) + 1, []).append(key)
+
+        if key in self._main:
+            self._main[key] = item
+            return
+
+        window = self._window
+        window[key] = item
+        if len(window) > self._window_size:
+            candidate = next(iter(window))
+            self._admit(candidate, window.pop(candidate), now)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or `default` if missing or expired."""
+        self._record(key)
+        item = self._main.get(key) or self._window.get(key)
+        if item is None or item[1] <= self.timer():
+            self.misses += 1
+            return default
+        self.hits += 1
+        return item[0]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value."""
+        item = self._main.pop(key, None) or self._window.pop(key, None)
+        return item[0] if item is not None else default
+
+    def clear(self) -> None:
+        """Remove all entries and forget access history."""
+        self._window.clear()
+        self._main.clear()
+        self._wheel.clear()
+        self._freq = {}
+        self._accesses = 0
+
+    def expire(self, now: float = None) -> int:
+        """
+        Remove every entry that has expired by `now`.
+
+        Returns the number of entries removed. Must be serialized with writes.
+        """
+        if now is None:
+            now = self.timer()
+        due = math.floor(now)
+        if due < self._next_tick:
+            return 0
+
+        wheel, window, main = self._wheel, self._window, self._main
+        if due - self._next_tick > len(wheel):
+            ticks = [tick for tick in wheel if tick <= due]
+        else:
+            ticks = range(self._next_tick, due + 1)
+
+        removed = 0
+        for tick in ticks:
+            for key in wheel.pop(tick, ()):
+                # The key may have been refreshed or evicted since it was bucketed
+                for segment in (window, main):
+                    item = segment.get(key)
+                    if item is not None and item[1] <= now:
+                        del segment[key]
+                        removed += 1
+        self._next_tick = due + 1
+        return removed
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimated recent access count for a key."""
+        return self._freq.get(hash(key), 0)
+
+    def _record(self, key: Hashable) -> None:
+        """Count an access, aging all counters once the sample period ends."""
+        h = hash(key)
+        freq = self._freq
+        count = freq.get(h, 0)
+        if count < MAX_FREQUENCY:
+            freq[h] = count + 1
+
+        self._accesses += 1
+        if self._accesses >= self._sample_size:
+            self._accesses = 0
+            self._freq = {k: c >> 1 for k, c in freq.copy().items() if c > 1}
+
+    def _admit(self, key: Hashable, item: Tuple[Any, float], now: float) -> None:
+        """Move an entry evicted from the window into the main segment if it earns it."""
+        if item[1] <= now:
+            return
+
+        main = self._main
+        if len(main) >= self._main_size:
+            self._expire_main(now)
+        if len(main) < self._main_size:
+            main[key] = item
+            return
+
+        victim = next(iter(main))
+        self.evictions += 1
+        if self.frequency(key) > self.frequency(victim):
+            del main[victim]
+            main[key] = item
+        else:
+            # Give the victim a second chance so the next contest sees a new one
+            main[victim] = main.pop(victim)
+
+    def _expire_main(self, now: float) -> None:
+        """Drop expired entries from the head of the main segment."""
+        main = self._main
+        while main:
+            key = next(iter(main))
+            if main[key][1] > now:
+                break
+            del main[key]
+
+
+class ShardedTinyLFUCache:
+    """
+    Thread-safe TinyLFUCache split into independently locked shards.
+
+    Keys map to a shard by hash, so writers for different keys rarely
+    contend. Reads go straight to the shard without locking. Each shard
+    applies admission and expiry on its own slice of `maxsize`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shards: int = 16, timer: Callable[[], float] = time.monotonic):
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        while shards > 1 and maxsize // shards < MIN_SHARD_SIZE:
+            shards //= 2
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._mask = shards - 1
+        self._shards = [TinyLFUCache(maxsize // shards, ttl, timer) for _ in range(shards)]
+        self._locks = [Lock() for _ in range(shards)]
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shards[hash(key) & self._mask]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            self._shards[i][key] = value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or `default` if missing or expired."""
+        return self._shards[hash(key) & self._mask].get(key, default)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value."""
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            return self._shards[i].pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries from every shard."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def expire(self, now: float = None) -> int:
+        """Sweep expired entries from every shard. Returns the number removed."""
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                removed += shard.expire(now)
+        return removed
@@ -1,39 +1,74 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from starlette.routing import Route
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 import time
+import orjson
 
 # Load environment variables
 load_dotenv()
 
 # Import core utilities
-from app.core.logging import setup_logging, get_logger, generate_request_id, set_request_id, get_request_id
-from app.core.rate_limit import limiter, rate_limit_exceeded_handler
+from app.core.logging import (
+    setup_logging, get_logger, generate_request_id, set_request_id, get_request_id, set_request_start, elapsed_ms,
+    ENVIRONMENT, IS_PRODUCTION,
+)
+from app.core.rate_limit import limiter, rate_limit_exceeded_handler, RateLimitExceeded
+from app.core import concurrency
 from app.core.exceptions import APIException
-from app.core.responses import error_response
-from app.core.cache import cache
+from app.core.responses import error_response, ORJSONResponse
+from app.core.cache import cache, run_expiry
+from app.services.algolia_service import algolia_service
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
 
+def cache_openapi(app: FastAPI) -> None:
+    """
+    Build the OpenAPI schema once and serve it from `openapi_url` as
+    pre-encoded bytes, replacing FastAPI's route that re-encodes it per hit.
+    """
+    payload = orjson.dumps(app.openapi())
+    
+    async def openapi(request: Request) -> Response:
+        return Response(content=payload, media_type="application/json")
+    
+    routes = app.router.routes
+    for i, route in enumerate(routes):
+        if getattr(route, "path", None) == app.openapi_url:
+            routes[i] = Route(app.openapi_url, openapi, include_in_schema=False)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting PCBuild Assist API", data={
         "version": "1.0.0",
-        "environment": os.getenv("ENV", "development")
+        "environment": ENVIRONMENT
     })
+    cache_openapi(app)
+    expiry_task = asyncio.create_task(run_expiry())
+    # Connect to Algolia in the background so startup isn't held up by it
+    warm_up_task = asyncio.create_task(algolia_service.warm_up())
+    preset_task = asyncio.create_task(suggestions.refresh_presets())
     yield
     # Shutdown
     logger.info("Shutting down PCBuild Assist API")
+    expiry_task.cancel()
+    warm_up_task.cancel()
+    preset_task.cancel()
     cache.clear()
+    await cache.close()
+    await concurrency.close()
+    await algolia_service.close()
 
 
 # Create FastAPI app with enhanced configuration
@@ -63,6 +98,7 @@ Currently no authentication required. Rate limits apply per IP.
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     responses={
         400: {"description": "Bad Request - Invalid parameters"},
         404: {"description": "Not Found - Resource doesn't exist"},
@@ -75,81 +111,109 @@ Currently no authentication required. Rate limits apply per IP.
 
 # Add rate limiter
 app.state.limiter = limiter
-app.add_exception_handler(429, rate_limit_exceeded_handler)
-
-# Configure CORS
-frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
-allowed_origins = [
-    frontend_url,
-    "http://localhost:5173",  # Vite default
-    "http://localhost:3000",  # React default
-    "http://127.0.0.1:5173",
-    "http://127.0.0.1:3000",
-]
-
-# Add production origins if configured
-if os.getenv("PRODUCTION_ORIGIN"):
-    allowed_origins.append(os.getenv("PRODUCTION_ORIGIN"))
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Processing-Time", "X-RateLimit-Remaining"],
-)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 
 # ==================== MIDDLEWARE ====================
 
-@app.middleware("http")
-async def request_middleware(request: Request, call_next):
+class RequestTrackingMiddleware:
     """
-    Middleware for request tracking, timing, and logging.
-    """
-    # Generate and set request ID
-    request_id = request.headers.get("X-Request-ID") or generate_request_id()
-    set_request_id(request_id)
+    ASGI middleware for request tracking, timing, and logging.
     
-    # Record start time
-    start_time = time.perf_counter()
+    Works on the raw scope and messages, so no Request/Response objects are
+    built and the app runs in the same task (no call_next hand-off).
+    """
     
-    # Log request
-    logger.info(f"{request.method} {request.url.path}", data={
-        "method": request.method,
-        "path": request.url.path,
-        "query": str(request.query_params),
-        "client_ip": request.client.host if request.client else "unknown"
-    })
+    def __init__(self, app):
+        self.app = app
     
-    try:
-        # Process request
-        response: Response = await call_next(request)
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Calculate processing time
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        # Generate and set request ID
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or generate_request_id()
+        set_request_id(request_id)
         
-        # Add custom headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Processing-Time"] = str(process_time)
+        # Record start time; response helpers read it for meta.processing_time_ms
+        start_ns = time.perf_counter_ns()
+        set_request_start(start_ns)
         
-        # Log response
-        logger.info(f"Response {response.status_code}", data={
-            "status_code": response.status_code,
-            "processing_time_ms": process_time
-        })
+        # Log request (records are formatted and written off the event loop)
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        if log_enabled:
+            method, path = scope["method"], scope["path"]
+            client = scope.get("client")
+            logger.info(f"{method} {path}", data={
+                "method": method,
+                "path": path,
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "client_ip": client[0] if client else "unknown"
+            })
         
-        return response
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # Calculate processing time
+                process_time = elapsed_ms(start_ns)
+                
+                # Add custom headers
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                headers.append((b"x-processing-time", str(process_time).encode()))
+                message = {**message, "headers": headers}
+                
+                # Log response
+                if log_enabled:
+                    status_code = message["status"]
+                    logger.info(f"Response {status_code}", data={
+                        "status_code": status_code,
+                        "processing_time_ms": process_time
+                    })
+            await send(message)
         
-    except Exception as e:
-        # Log error
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        logger.error(f"Request failed: {str(e)}", data={
-            "error": str(e),
-            "processing_time_ms": process_time
-        })
-        raise
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            # Log error
+            process_time = elapsed_ms(start_ns)
+            logger.error(f"Request failed: {str(e)}", data={
+                "error": str(e),
+                "processing_time_ms": process_time
+            })
+            raise
+
+
+app.add_middleware(RequestTrackingMiddleware)
+
+
+# Configure CORS. Registered after the tracking middleware so it is the outer
+# layer and answers preflight requests without request logging or ID generation.
+# A frozenset, so the per-request origin check is a hash lookup and duplicates
+# (e.g. FRONTEND_URL left at its default) collapse. Unset optional origins are dropped.
+allowed_origins = frozenset(filter(None, (
+    os.getenv("FRONTEND_URL", "http://localhost:3000"),
+    "http://localhost:5173",  # Vite default
+    "http://localhost:3000",  # React default
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:3000",
+    os.getenv("PRODUCTION_ORIGIN"),  # Production origin, if configured
+)))
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=allowed_origins,
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"],  # The API has no PUT/DELETE routes
+    allow_headers=["Accept", "Accept-Language", "Content-Language", "Content-Type", "Authorization", "X-Request-ID"],
+    expose_headers=["X-Request-ID", "X-Processing-Time", "X-RateLimit-Remaining"],
+    max_age=600,  # Let browsers cache preflight responses for 10 minutes
+)
 
 
 # ==================== EXCEPTION HANDLERS ====================
@@ -157,7 +221,7 @@ async def request_middleware(request: Request, call_next):
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
     """Handle custom API exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=error_response(
             code=exc.code,
@@ -172,15 +236,12 @@ async def api_exception_handler(request: Request, exc: APIException):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle Pydantic validation errors."""
-    errors = []
-    for error in exc.errors():
-        errors.append({
-            "field": ".".join(str(loc) for loc in error["loc"]),
-            "message": error["msg"],
-            "type": error["type"]
-        })
+    errors = [
+        {"field": ".".join(map(str, error["loc"])), "message": error["msg"], "type": error["type"]}
+        for error in exc.errors()
+    ]
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content=error_response(
             code="VALIDATION_ERROR",
@@ -196,12 +257,12 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.exception(f"Unhandled exception: {str(exc)}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=error_response(
             code="INTERNAL_ERROR",
             message="An unexpected error occurred",
-            details={"type": type(exc).__name__} if os.getenv("ENV") != "production" else None,
+            details={"type": type(exc).__name__} if not IS_PRODUCTION else None,
             request_id=get_request_id()
         )
     )
@@ -232,27 +293,31 @@ app.include_router(
 
 # ==================== ROOT ENDPOINTS ====================
 
+# The root payload never changes, so it is serialized once at import
+_ROOT_PAYLOAD = orjson.dumps({
+    "name": "PCBuild Assist API",
+    "version": "1.0.0",
+    "description": "Smart PC component builder with Algolia integration",
+    "documentation": {
+        "swagger": "/docs",
+        "redoc": "/redoc",
+        "openapi": "/openapi.json"
+    },
+    "endpoints": {
+        "health": "/health",
+        "components": "/api/components",
+        "compatibility": "/api/compatibility",
+        "suggestions": "/api/suggestions"
+    }
+})
+
+
 @app.get("/", tags=["System"])
 async def root():
     """
     Root endpoint - API information and quick links.
     """
-    return {
-        "name": "PCBuild Assist API",
-        "version": "1.0.0",
-        "description": "Smart PC component builder with Algolia integration",
-        "documentation": {
-            "swagger": "/docs",
-            "redoc": "/redoc",
-            "openapi": "/openapi.json"
-        },
-        "endpoints": {
-            "health": "/health",
-            "components": "/api/components",
-            "compatibility": "/api/compatibility",
-            "suggestions": "/api/suggestions"
-        }
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 @app.get("/health", tags=["System"])
@@ -265,7 +330,8 @@ async def health_check():
         "status": "healthy",
         "service": "PCBuild Assist API",
         "version": "1.0.0",
-        "cache_stats": cache.stats()
+        "cache_stats": cache.stats(),
+        "cache_l2": "redis" if cache.l2_enabled() else "disabled"
     }
 
 
@@ -277,7 +343,8 @@ async def cache_stats():
     """
     return {
         "success": True,
-        "data": cache.stats()
+        "data": cache.stats(),
+        "l2": "redis" if cache.l2_enabled() else "disabled"
     }
 
 
@@ -287,7 +354,7 @@ async def clear_cache(cache_name: str = None):
     Clear cache (admin endpoint).
     Optionally specify a specific cache to clear.
     """
-    cache.clear(cache_name)
+    await cache.aclear(cache_name)
     return {
         "success": True,
         "message": f"Cache {'`' + cache_name + '`' if cache_name else 'all'} cleared"
@@ -1,19 +1,65 @@
 from fastapi import APIRouter, Request
-from typing import Dict, List
-import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import xxhash
 
-from app.services.compatibility_service import compatibility_service
+from app.services.compatibility_service import compatibility_service, COMPATIBILITY_ATTRIBUTES
 from app.services.algolia_service import algolia_service
-from app.models.component import BuildCompatibilityRequest, BuildCompatibilityResponse
+from app.models.component import BuildCompatibilityRequest
 from app.core.exceptions import NotFoundException, ValidationException, AlgoliaException
 from app.core.responses import success_response
-from app.core.cache import cache
+from app.core.cache import cache, single_flight
 from app.core.logging import get_logger, get_request_id
 from app.core.rate_limit import limiter
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Component category -> substrings that identify it in an Algolia `type`
+_CATEGORY_MARKERS = {
+    "cpu": ("CPU",),
+    "motherboard": ("Motherboard",),
+    "ram": ("Memory",),
+    "gpu": ("GPU", "Video"),
+}
+
+# Unordered category pair -> (checker, compatibility type, category of the checker's first argument)
+_PAIR_CHECKS = {
+    frozenset(("cpu", "motherboard")): (compatibility_service.check_cpu_motherboard, "cpu_motherboard_socket", "cpu"),
+    frozenset(("ram", "motherboard")): (compatibility_service.check_ram_motherboard, "ram_motherboard_ddr", "ram"),
+    frozenset(("gpu", "motherboard")): (compatibility_service.check_gpu_motherboard, "gpu_motherboard_pcie", "gpu"),
+}
+
+
+@lru_cache(maxsize=256)
+def _classify(component_type: str) -> Optional[str]:
+    """Map an Algolia component type to its category, or None if it has no pair checks."""
+    for category, markers in _CATEGORY_MARKERS.items():
+        if any(marker in component_type for marker in markers):
+            return category
+    return None
+
+
+def _run_pair_check(pair_check: Tuple, comp1: Dict, category1: Optional[str], comp2: Dict) -> Tuple[bool, str]:
+    """Run a `_PAIR_CHECKS` checker with the two components in the order it expects."""
+    checker, _, first_category = pair_check
+    if category1 == first_category:
+        return checker(comp1, comp2)
+    return checker(comp2, comp1)
+
+
+def _pair_cache_key(component1_id: str, component2_id: str) -> str:
+    """Cache key for a pair check; the pair is order-independent, so key on the sorted ids."""
+    first, second = sorted((component1_id, component2_id))
+    return xxhash.xxh3_128_hexdigest(f"{first}\0{second}".encode())
+
+
+def _oriented(result: Dict, component1_id: str) -> Dict:
+    """A cached pair result with `component1` matching the requested first id."""
+    if result["component1"]["id"] == component1_id:
+        return result
+    return {**result, "component1": result["component2"], "component2": result["component1"]}
+
 
 @router.post("/check-build")
 @limiter.limit("30/minute")
@@ -32,8 +78,6 @@ async def check_build_compatibility(
     
     **Rate Limit:** 30 requests/minute
     """
-    start_time = time.perf_counter()
-    
     try:
         # Fetch actual component data from Algolia
         build_data = {}
@@ -47,16 +91,29 @@ async def check_build_compatibility(
         }
         
         # Track which components were requested vs found
-        components_requested = []
-        components_found = []
+        components_requested = [ctype for ctype, cid in component_mapping.items() if cid]
+        
+        # Identical builds share a result; key on the role=id pairs in fixed role order
+        cache_key = xxhash.xxh3_128_hexdigest(
+            "|".join(f"{ctype}={component_mapping[ctype]}" for ctype in components_requested).encode()
+        )
+        cached_result = await cache.aget("compat_build", cache_key)
+        if cached_result:
+            return success_response(
+                data=cached_result,
+                request_id=get_request_id()
+            )
         
-        for component_type, component_id in component_mapping.items():
-            if component_id:
-                components_requested.append(component_type)
-                component = algolia_service.get_component_by_id(component_id)
-                if component:
-                    build_data[component_type] = component
-                    components_found.append(component_type)
+        # Fetch all requested components in one round trip
+        results = await algolia_service.get_components_by_ids(
+            [component_mapping[ctype] for ctype in components_requested],
+            attributes=COMPATIBILITY_ATTRIBUTES
+        )
+        for component_type in components_requested:
+            component = results.get(component_mapping[component_type])
+            if component:
+                build_data[component_type] = component
+        components_found = list(build_data)
         
         logger.info("Checking build compatibility", data={
             "components_requested": components_requested,
@@ -66,20 +123,33 @@ async def check_build_compatibility(
         # Check compatibility
         result = compatibility_service.check_full_build(build_data)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        checks = result["checks"]
+        passed = sum(1 for check in checks if check["compatible"])
+        recommended_psu = result["recommended_psu"]
         
-        return success_response(
-            data={
-                "is_compatible": result.get("is_compatible", False),
-                "overall_score": result.get("overall_score", 0),
-                "issues": result.get("issues", []),
-                "warnings": result.get("warnings", []),
-                "recommendations": result.get("recommendations", []),
-                "power_analysis": result.get("power_analysis", {}),
-                "components_analyzed": components_found
+        data = {
+            "is_compatible": result["compatible"],
+            "overall_score": round(100 * passed / len(checks)) if checks else 100,
+            "issues": [check["message"] for check in checks if check["severity"] == "error"],
+            "warnings": result["warnings"],
+            "recommendations": (
+                [f"Use a power supply rated for at least {recommended_psu}W"] if "psu" not in build_data else []
+            ),
+            "power_analysis": {
+                "total_power": result["total_power"],
+                "recommended_psu": recommended_psu
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+            "checks": checks,
+            "components_analyzed": components_found
+        }
+        
+        # Only cache complete builds, so a lookup failure isn't remembered
+        if len(components_found) == len(components_requested):
+            await cache.aset("compat_build", cache_key, data)
+        
+        return success_response(
+            data=data,
+            request_id=get_request_id()
         )
     
     except Exception as e:
@@ -104,21 +174,26 @@ async def check_component_pair(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
-    
-    # Check cache first
-    cache_key = f"pair:{min(component1_id, component2_id)}:{max(component1_id, component2_id)}"
-    cached_result = cache.get("compatibility", cache_key)
+    # Check cache first (shared with batch-check)
+    cache_key = _pair_cache_key(component1_id, component2_id)
+    cached_result = await cache.aget("compat_pair", cache_key)
     if cached_result:
         return success_response(
-            data=cached_result,
-            request_id=get_request_id(),
-            processing_time_ms=0
+            data=_oriented(cached_result, component1_id),
+            request_id=get_request_id()
         )
     
     try:
-        comp1 = algolia_service.get_component_by_id(component1_id)
-        comp2 = algolia_service.get_component_by_id(component2_id)
+        # Fetch both components in one round trip, shared by concurrent misses on this pair
+        components = await single_flight(
+            "compat_pair",
+            cache_key,
+            lambda: algolia_service.get_components_by_ids(
+                [component1_id, component2_id], attributes=COMPATIBILITY_ATTRIBUTES
+            )
+        )
+        comp1 = components.get(component1_id)
+        comp2 = components.get(component2_id)
         
         if not comp1:
             raise NotFoundException(resource="Component", identifier=component1_id)
@@ -133,30 +208,12 @@ async def check_component_pair(
         message = "Cannot determine compatibility between these component types"
         compatibility_type = "unknown"
         
-        # Check based on types
-        if ("CPU" in type1 and "Motherboard" in type2) or ("Motherboard" in type1 and "CPU" in type2):
-            cpu = comp1 if "CPU" in type1 else comp2
-            mb = comp2 if "Motherboard" in type2 else comp1
-            compatible, message = compatibility_service.check_cpu_motherboard(cpu, mb)
-            compatibility_type = "cpu_motherboard_socket"
-        
-        elif ("Memory" in type1 and "Motherboard" in type2) or ("Motherboard" in type1 and "Memory" in type2):
-            ram = comp1 if "Memory" in type1 else comp2
-            mb = comp2 if "Motherboard" in type2 else comp1
-            compatible, message = compatibility_service.check_ram_motherboard(ram, mb)
-            compatibility_type = "ram_motherboard_ddr"
-        
-        elif ("GPU" in type1 or "Video" in type1) and "Motherboard" in type2:
-            gpu = comp1
-            mb = comp2
-            compatible, message = compatibility_service.check_gpu_motherboard(gpu, mb)
-            compatibility_type = "gpu_motherboard_pcie"
-        
-        elif ("Motherboard" in type1) and ("GPU" in type2 or "Video" in type2):
-            mb = comp1
-            gpu = comp2
-            compatible, message = compatibility_service.check_gpu_motherboard(gpu, mb)
-            compatibility_type = "gpu_motherboard_pcie"
+        # Dispatch on the unordered pair of categories
+        category1 = _classify(type1)
+        pair_check = _PAIR_CHECKS.get(frozenset((category1, _classify(type2))))
+        if pair_check:
+            compatibility_type = pair_check[1]
+            compatible, message = _run_pair_check(pair_check, comp1, category1, comp2)
         
         result = {
             "component1": {
@@ -175,9 +232,7 @@ async def check_component_pair(
         }
         
         # Cache the result
-        cache.set("compatibility", cache_key, result)
-        
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        await cache.aset("compat_pair", cache_key, result)
         
         logger.info("Pair compatibility check completed", data={
             "type1": type1,
@@ -187,8 +242,7 @@ async def check_component_pair(
         
         return success_response(
             data=result,
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+            request_id=get_request_id()
         )
     
     except NotFoundException:
@@ -208,15 +262,18 @@ async def batch_check_compatibility(
     Check compatibility between multiple components at once.
     
     Performs pairwise compatibility checks for all provided components.
-    Useful for validating partial builds.
+    Useful for validating partial builds. A pair whose check fails is
+    returned with `compatible: null` and an `error`, and counted in
+    `partial_failures`; the other pairs are still reported.
     
     **Rate Limit:** 10 requests/minute (expensive operation)
     """
-    start_time = time.perf_counter()
+    # Repeated IDs add no pairs; drop them (keeping order) before validating
+    component_ids = list(dict.fromkeys(component_ids))
     
     if len(component_ids) < 2:
         raise ValidationException(
-            message="At least 2 component IDs are required",
+            message="At least 2 distinct component IDs are required",
             field="component_ids"
         )
     
@@ -227,12 +284,8 @@ async def batch_check_compatibility(
         )
     
     try:
-        # Fetch all components
-        components = {}
-        for comp_id in component_ids:
-            comp = algolia_service.get_component_by_id(comp_id)
-            if comp:
-                components[comp_id] = comp
+        # Fetch all components in one round trip; found IDs come back in request order
+        components = await algolia_service.get_components_by_ids(component_ids, attributes=COMPATIBILITY_ATTRIBUTES)
         
         if len(components) < 2:
             raise ValidationException(
@@ -245,75 +298,73 @@ async def batch_check_compatibility(
         issues = []
         all_compatible = True
         
-        comp_list = list(components.items())
+        # Classify each component once and keep the pairs that have a checker
+        comp_list = [
+            (comp_id, comp, comp.get("type", ""), _classify(comp.get("type", "")))
+            for comp_id, comp in components.items()
+        ]
+        pairs = []
         for i in range(len(comp_list)):
             for j in range(i + 1, len(comp_list)):
-                id1, comp1 = comp_list[i]
-                id2, comp2 = comp_list[j]
-                
-                type1 = comp1.get("type", "")
-                type2 = comp2.get("type", "")
-                
-                # Only check relevant pairs
-                relevant_pairs = [
-                    ("CPU", "Motherboard"),
-                    ("Memory", "Motherboard"),
-                    ("GPU", "Motherboard"),
-                    ("Video Card", "Motherboard")
-                ]
-                
-                is_relevant = False
-                for t1, t2 in relevant_pairs:
-                    if (t1 in type1 and t2 in type2) or (t1 in type2 and t2 in type1):
-                        is_relevant = True
-                        break
-                
-                if not is_relevant:
-                    continue
-                
-                # Check compatibility
-                compatible = True
-                message = "Compatible"
-                
-                if ("CPU" in type1 and "Motherboard" in type2) or ("Motherboard" in type1 and "CPU" in type2):
-                    cpu = comp1 if "CPU" in type1 else comp2
-                    mb = comp2 if "Motherboard" in type2 else comp1
-                    compatible, message = compatibility_service.check_cpu_motherboard(cpu, mb)
-                elif ("Memory" in type1 and "Motherboard" in type2) or ("Motherboard" in type1 and "Memory" in type2):
-                    ram = comp1 if "Memory" in type1 else comp2
-                    mb = comp2 if "Motherboard" in type2 else comp1
-                    compatible, message = compatibility_service.check_ram_motherboard(ram, mb)
-                elif ("GPU" in type1 or "Video" in type1) or ("GPU" in type2 or "Video" in type2):
-                    if "Motherboard" in type1:
-                        mb, gpu = comp1, comp2
-                    else:
-                        gpu, mb = comp1, comp2
-                    compatible, message = compatibility_service.check_gpu_motherboard(gpu, mb)
-                
-                check_result = {
-                    "component1": {"id": id1, "name": comp1.get("name"), "type": type1},
-                    "component2": {"id": id2, "name": comp2.get("name"), "type": type2},
-                    "compatible": compatible,
-                    "message": message
-                }
-                checks.append(check_result)
-                
-                if not compatible:
+                pair_check = _PAIR_CHECKS.get(frozenset((comp_list[i][3], comp_list[j][3])))
+                if pair_check:
+                    pairs.append((comp_list[i], comp_list[j], pair_check))
+        
+        # Look up every pair verdict at once (shared with check-pair)
+        cache_keys = [_pair_cache_key(first[0], second[0]) for first, second, _ in pairs]
+        cached_pairs = await cache.aget_many("compat_pair", cache_keys)
+        new_pairs = {}
+        partial_failures = 0
+        
+        for (first, second, pair_check), cache_key in zip(pairs, cache_keys):
+            id1, comp1, type1, category1 = first
+            id2, comp2, type2, category2 = second
+            
+            check_result = {
+                "component1": {"id": id1, "name": comp1.get("name"), "type": type1},
+                "component2": {"id": id2, "name": comp2.get("name"), "type": type2}
+            }
+            
+            # Check compatibility, unless the verdict is already cached
+            cached = cached_pairs.get(cache_key)
+            if cached:
+                compatible, message = cached["compatible"], cached["message"]
+            else:
+                compatibility_type = pair_check[1]
+                try:
+                    compatible, message = _run_pair_check(pair_check, comp1, category1, comp2)
+                except Exception as e:
+                    # Report this pair as unchecked and keep the other results
+                    logger.warning(f"Pair check failed: {str(e)}", data={"component1": id1, "component2": id2})
+                    partial_failures += 1
                     all_compatible = False
-                    issues.append(message)
+                    checks.append({**check_result, "compatible": None, "error": str(e)})
+                    continue
+            
+            check_result["compatible"] = compatible
+            check_result["message"] = message
+            checks.append(check_result)
+            if not cached:
+                # Stored in check-pair's result format so both endpoints can reuse it
+                new_pairs[cache_key] = {**check_result, "compatibility_type": compatibility_type}
+            
+            if not compatible:
+                all_compatible = False
+                issues.append(message)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        if new_pairs:
+            await cache.aset_many("compat_pair", new_pairs)
         
         return success_response(
             data={
                 "all_compatible": all_compatible,
                 "components_checked": len(components),
                 "pairs_checked": len(checks),
+                "partial_failures": partial_failures,
                 "checks": checks,
                 "issues": issues
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+            request_id=get_request_id()
         )
         
     except ValidationException:
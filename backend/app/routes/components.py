@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Query, Request
+from fastapi.encoders import jsonable_encoder
 from typing import Optional
-import time
 
 from app.services.algolia_service import algolia_service
 from app.models.component import ComponentResponse
 from app.core.exceptions import NotFoundException, ValidationException, AlgoliaException
-from app.core.responses import success_response, paginated_response
-from app.core.cache import cached, cache
+from app.core.responses import success_response, paginated_response, cacheable_response
+from app.core.cache import cached, cache, single_flight
 from app.core.logging import get_logger, get_request_id
 from app.core.rate_limit import limiter
 
@@ -36,8 +36,6 @@ async def search_components(
     
     **Rate Limit:** 30 requests/minute
     """
-    start_time = time.perf_counter()
-    
     # Validate price range
     if min_price and max_price and min_price > max_price:
         raise ValidationException(
@@ -67,26 +65,28 @@ async def search_components(
     })
     
     try:
-        results = algolia_service.search_components(
+        results = await algolia_service.search_components(
             q, 
             filters=filters, 
             limit=limit, 
             offset=page * limit
         )
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return paginated_response(
+        response = paginated_response(
             data=results.get("hits", []),
             page=page,
             per_page=limit,
             total_items=results.get("nbHits", 0),
             request_id=get_request_id(),
-            processing_time_ms=process_time,
             query=q,
             filters=filters
         )
         
+        # Failed searches come back empty; don't let clients or CDNs keep those
+        if "error" in results:
+            return response
+        return cacheable_response(request, response, cache.ttl("search"))
+        
     except Exception as e:
         logger.error(f"Search failed: {str(e)}", data={"query": q, "error": str(e)})
         raise AlgoliaException(operation="search", message=str(e))
@@ -112,8 +112,6 @@ async def get_by_type(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
-    
     # Validate component type
     valid_types = ["CPU", "GPU", "Motherboard", "Memory", "Power Supply", "Internal Hard Drive", "Video Card"]
     if component_type not in valid_types:
@@ -131,27 +129,28 @@ async def get_by_type(
         filters["performance_tier"] = performance_tier
     
     try:
-        results = algolia_service.search_by_type(component_type, filters=filters, limit=limit)
+        # Price sorts are served pre-sorted by Algolia replicas
+        # Errors are raised (and answered uncached) so an empty list really means no matches
+        results = await algolia_service.search_by_type(
+            component_type, filters=filters, limit=limit, sort_by=sort_by, raise_errors=True
+        )
         
-        # Apply sorting
-        if sort_by == "price_asc":
-            results.sort(key=lambda x: x.get("price", 999999))
-        elif sort_by == "price_desc":
-            results.sort(key=lambda x: x.get("price", 0), reverse=True)
-        elif sort_by == "name":
+        # Algolia can't rank alphabetically, so name order is applied here
+        if sort_by == "name":
             results.sort(key=lambda x: x.get("name", ""))
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
-            data={
-                "type": component_type,
-                "count": len(results),
-                "results": results,
-                "filters_applied": filters
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+        return cacheable_response(
+            request,
+            success_response(
+                data={
+                    "type": component_type,
+                    "count": len(results),
+                    "results": results,
+                    "filters_applied": filters
+                },
+                request_id=get_request_id()
+            ),
+            cache.ttl("search")
         )
         
     except Exception as e:
@@ -173,35 +172,41 @@ async def get_facets(
     
     **Rate Limit:** 30 requests/minute
     """
-    start_time = time.perf_counter()
-    
     # Check cache first
     cache_key = f"facets:{component_type or 'all'}"
-    cached_result = cache.get("facets", cache_key)
+    cached_result = await cache.aget("facets", cache_key)
     if cached_result:
-        return success_response(
-            data=cached_result,
-            request_id=get_request_id(),
-            processing_time_ms=0
+        data, etag = cached_result
+        return cacheable_response(
+            request,
+            success_response(data=data, request_id=get_request_id()),
+            cache.ttl("facets"),
+            etag=etag
         )
     
     try:
-        facets = algolia_service.get_facets(component_type)
-        
-        # Cache the result
-        cache.set("facets", cache_key, facets)
+        # Concurrent misses share one Algolia request
+        facets = await single_flight("facets", cache_key, lambda: algolia_service.get_facets(component_type))
+        data = {
+            "component_type": component_type,
+            "available_filters": facets
+        }
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        # Failed lookups come back empty; don't let clients or CDNs keep those
+        if not facets:
+            return success_response(data=data, request_id=get_request_id())
         
-        return success_response(
-            data={
-                "component_type": component_type,
-                "available_filters": facets
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+        response = cacheable_response(
+            request,
+            success_response(data=data, request_id=get_request_id()),
+            cache.ttl("facets")
         )
         
+        # Cache the result with its ETag
+        await cache.aset("facets", cache_key, (data, response.headers["etag"]))
+        
+        return response
+        
     except Exception as e:
         logger.error(f"Get facets failed: {str(e)}")
         raise AlgoliaException(operation="get_facets", message=str(e))
@@ -221,38 +226,49 @@ async def get_popular_components(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"popular:{component_type}:{limit}"
+    cached_result = await cache.aget("popular", cache_key)
+    if cached_result:
+        data, etag = cached_result
+        return cacheable_response(
+            request,
+            success_response(data=data, request_id=get_request_id()),
+            cache.ttl("popular"),
+            etag=etag
+        )
     
     try:
         filters = {}
         if component_type:
             filters["type"] = component_type
         
-        # Search with empty query to get all, sorted by popularity
-        results = algolia_service.search_components("", filters=filters, limit=limit)
-        
-        # Sort by recommendation score if available, else by rating
+        # Empty query on the popularity replica: hits arrive ranked by
+        # recommendation score, then average rating
+        results = await algolia_service.search_components("", filters=filters, limit=limit, sort_by="popular")
         hits = results.get("hits", [])
-        hits.sort(
-            key=lambda x: (
-                x.get("recommendation_score", 0),
-                x.get("rating", {}).get("average", 0) if isinstance(x.get("rating"), dict) else 0
-            ),
-            reverse=True
-        )
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = {
+            "component_type": component_type,
+            "count": len(hits),
+            "results": hits
+        }
         
-        return success_response(
-            data={
-                "component_type": component_type,
-                "count": len(hits[:limit]),
-                "results": hits[:limit]
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+        # Failed searches come back as empty hits; don't let clients or CDNs keep those
+        if not hits:
+            return success_response(data=data, request_id=get_request_id())
+        
+        response = cacheable_response(
+            request,
+            success_response(data=data, request_id=get_request_id()),
+            cache.ttl("popular")
         )
         
+        # Cache the result with its ETag
+        await cache.aset("popular", cache_key, (data, response.headers["etag"]))
+        
+        return response
+        
     except Exception as e:
         logger.error(f"Get popular failed: {str(e)}")
         raise AlgoliaException(operation="get_popular", message=str(e))
@@ -271,35 +287,41 @@ async def get_component_details(
     
     **Rate Limit:** 100 requests/minute
     """
-    start_time = time.perf_counter()
-    
     # Check cache
     cache_key = f"component:{component_id}"
-    cached_result = cache.get("components", cache_key)
+    cached_result = await cache.aget("components", cache_key)
     if cached_result:
-        return success_response(
-            data=cached_result,
-            request_id=get_request_id(),
-            processing_time_ms=0
+        data, etag = cached_result
+        return cacheable_response(
+            request,
+            success_response(data=data, request_id=get_request_id()),
+            cache.ttl("components"),
+            etag=etag
         )
     
     try:
-        component = algolia_service.get_component_by_id(component_id)
+        # Concurrent misses share one Algolia request
+        component = await single_flight(
+            "components", cache_key, lambda: algolia_service.get_component_by_id(component_id)
+        )
         
         if not component:
             raise NotFoundException(resource="Component", identifier=component_id)
         
-        # Cache the result
-        cache.set("components", cache_key, component)
+        # Plain JSON form, so the entry can also be shared through Redis
+        component = jsonable_encoder(component)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
-            data=component,
-            request_id=get_request_id(),
-            processing_time_ms=process_time
+        response = cacheable_response(
+            request,
+            success_response(data=component, request_id=get_request_id()),
+            cache.ttl("components")
         )
         
+        # Cache the result with its ETag
+        await cache.aset("components", cache_key, (component, response.headers["etag"]))
+        
+        return response
+        
     except NotFoundException:
         raise
     except Exception as e:
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Query, Request
-from typing import Optional, List
-import time
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Dict, Literal, Optional, List
+import asyncio
+import heapq
 
 from app.services.suggestion_service import suggestion_service, ComponentScorer
 from app.services.algolia_service import algolia_service
 from app.core.exceptions import NotFoundException, ValidationException, AlgoliaException
-from app.core.responses import success_response
+from app.core.responses import success_response, ORJSONResponse
 from app.core.cache import cache
 from app.core.logging import get_logger, get_request_id
 from app.core.rate_limit import limiter
+from app.core.concurrency import ConcurrencyLimit
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Accepted query/path values; FastAPI rejects anything else with a 422
+Tier = Literal["budget", "mid-range", "high-end"]
+PresetId = Literal["budget-gaming", "mid-range-gaming", "high-end-gaming", "workstation"]
+
 
 @router.get("/cpus")
 @limiter.limit("60/minute")
@@ -29,23 +35,33 @@ async def suggest_cpus(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"cpus:{budget}:{use_case}:{limit}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        suggestions = suggestion_service.suggest_cpus(budget=budget, use_case=use_case, limit=limit)
+        suggestions = await suggestion_service.suggest_cpus(budget=budget, use_case=use_case, limit=limit)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = {
+            "budget": budget,
+            "use_case": use_case,
+            "suggestions": suggestions,
+            "count": len(suggestions)
+        }
         
-        return success_response(
-            data={
-                "budget": budget,
-                "use_case": use_case,
-                "suggestions": suggestions,
-                "count": len(suggestions)
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+        # Cache the result (failed searches come back empty and aren't cached)
+        if suggestions:
+            await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except Exception as e:
         logger.error(f"CPU suggestion failed: {str(e)}")
         raise AlgoliaException(operation="suggest_cpus", message=str(e))
@@ -65,32 +81,42 @@ async def suggest_compatible_gpu(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"gpu:{cpu_id}:{budget}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        cpu = algolia_service.get_component_by_id(cpu_id)
+        cpu = await algolia_service.get_component_by_id(cpu_id)
         if not cpu:
             raise NotFoundException(resource="CPU", identifier=cpu_id)
         
-        suggestions = suggestion_service.suggest_compatible_gpu(cpu, budget=budget)
+        suggestions = await suggestion_service.suggest_compatible_gpu(cpu, budget=budget)
         cpu_tier = cpu.get("performance_tier", "mid-range")
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
-            data={
-                "for_cpu": {
-                    "id": cpu_id,
-                    "name": cpu.get("name"),
-                    "tier": cpu_tier
-                },
-                "suggestions": suggestions,
-                "count": len(suggestions),
-                "reasoning": f"GPUs balanced for {cpu_tier} CPU to avoid bottlenecks"
+        data = {
+            "for_cpu": {
+                "id": cpu_id,
+                "name": cpu.get("name"),
+                "tier": cpu_tier
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+            "suggestions": suggestions,
+            "count": len(suggestions),
+            "reasoning": f"GPUs balanced for {cpu_tier} CPU to avoid bottlenecks"
+        }
+        
+        # Cache the result (failed searches come back empty and aren't cached)
+        if suggestions:
+            await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except NotFoundException:
         raise
     except Exception as e:
@@ -109,32 +135,42 @@ async def suggest_compatible_motherboard(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"motherboard:{cpu_id}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        cpu = algolia_service.get_component_by_id(cpu_id)
+        cpu = await algolia_service.get_component_by_id(cpu_id)
         if not cpu:
             raise NotFoundException(resource="CPU", identifier=cpu_id)
         
-        suggestions = suggestion_service.suggest_compatible_motherboard(cpu)
+        suggestions = await suggestion_service.suggest_compatible_motherboard(cpu)
         cpu_socket = cpu.get("specs", {}).get("socket") or cpu.get("socket", "unknown")
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
-            data={
-                "for_cpu": {
-                    "id": cpu_id,
-                    "name": cpu.get("name"),
-                    "socket": cpu_socket
-                },
-                "suggestions": suggestions,
-                "count": len(suggestions),
-                "reasoning": f"Motherboards with {cpu_socket} socket"
+        data = {
+            "for_cpu": {
+                "id": cpu_id,
+                "name": cpu.get("name"),
+                "socket": cpu_socket
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+            "suggestions": suggestions,
+            "count": len(suggestions),
+            "reasoning": f"Motherboards with {cpu_socket} socket"
+        }
+        
+        # Cache the result (failed searches come back empty and aren't cached)
+        if suggestions:
+            await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except NotFoundException:
         raise
     except Exception as e:
@@ -154,32 +190,42 @@ async def suggest_ram(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"ram:{motherboard_id}:{budget}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        motherboard = algolia_service.get_component_by_id(motherboard_id)
+        motherboard = await algolia_service.get_component_by_id(motherboard_id)
         if not motherboard:
             raise NotFoundException(resource="Motherboard", identifier=motherboard_id)
         
-        suggestions = suggestion_service.suggest_ram(motherboard, budget=budget)
+        suggestions = await suggestion_service.suggest_ram(motherboard, budget=budget)
         mb_memory_type = motherboard.get("specs", {}).get("memory_type") or motherboard.get("memory_type", "unknown")
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
-            data={
-                "for_motherboard": {
-                    "id": motherboard_id,
-                    "name": motherboard.get("name"),
-                    "memory_type": mb_memory_type
-                },
-                "suggestions": suggestions,
-                "count": len(suggestions),
-                "reasoning": f"RAM compatible with {mb_memory_type}"
+        data = {
+            "for_motherboard": {
+                "id": motherboard_id,
+                "name": motherboard.get("name"),
+                "memory_type": mb_memory_type
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+            "suggestions": suggestions,
+            "count": len(suggestions),
+            "reasoning": f"RAM compatible with {mb_memory_type}"
+        }
+        
+        # Cache the result (failed searches come back empty and aren't cached)
+        if suggestions:
+            await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except NotFoundException:
         raise
     except Exception as e:
@@ -187,6 +233,10 @@ async def suggest_ram(
         raise AlgoliaException(operation="suggest_ram", message=str(e))
 
 
+# PSU suggestions are searched and cached per this many watts of system power
+PSU_POWER_BUCKET = 50
+
+
 @router.get("/psu")
 @limiter.limit("60/minute")
 async def suggest_psu(
@@ -201,25 +251,33 @@ async def suggest_psu(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Round up to the next 50W so nearby requests share one cached search; rounding
+    # up keeps every suggested PSU at or above this request's recommended wattage
+    power_bucket = -(-total_power // PSU_POWER_BUCKET) * PSU_POWER_BUCKET
+    recommended_wattage = int(total_power * 1.25)
     
     try:
-        suggestions = suggestion_service.suggest_psu(total_power, limit=limit)
-        recommended_wattage = int(total_power * 1.25)
+        # Check cache
+        cache_key = f"psu:{power_bucket}:{limit}"
+        suggestions = await cache.aget("suggestions", cache_key)
+        if not suggestions:
+            suggestions = await suggestion_service.suggest_psu(power_bucket, limit=limit)
+            # Cache the result (failed searches come back empty and aren't cached)
+            if suggestions:
+                await cache.aset("suggestions", cache_key, suggestions)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = {
+            "total_power": total_power,
+            "recommended_wattage": recommended_wattage,
+            "suggestions": suggestions,
+            "count": len(suggestions),
+            "reasoning": f"PSU with ≥{recommended_wattage}W for {total_power}W system (25% headroom)"
+        }
         
-        return success_response(
-            data={
-                "total_power": total_power,
-                "recommended_wattage": recommended_wattage,
-                "suggestions": suggestions,
-                "count": len(suggestions),
-                "reasoning": f"PSU with ≥{recommended_wattage}W for {total_power}W system (25% headroom)"
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except Exception as e:
         logger.error(f"PSU suggestion failed: {str(e)}")
         raise AlgoliaException(operation="suggest_psu", message=str(e))
@@ -238,27 +296,37 @@ async def suggest_storage(
     
     **Rate Limit:** 60 requests/minute
     """
-    start_time = time.perf_counter()
+    # Check cache
+    cache_key = f"storage:{budget}:{capacity_gb}:{limit}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        suggestions = suggestion_service.suggest_storage(
+        suggestions = await suggestion_service.suggest_storage(
             budget=budget,
             capacity_gb=capacity_gb,
             limit=limit
         )
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = {
+            "budget": budget,
+            "capacity_gb": capacity_gb,
+            "suggestions": suggestions,
+            "count": len(suggestions)
+        }
         
-        return success_response(
-            data={
-                "budget": budget,
-                "capacity_gb": capacity_gb,
-                "suggestions": suggestions,
-                "count": len(suggestions)
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+        # Cache the result (failed searches come back empty and aren't cached)
+        if suggestions:
+            await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except Exception as e:
         logger.error(f"Storage suggestion failed: {str(e)}")
         raise AlgoliaException(operation="suggest_storage", message=str(e))
@@ -269,7 +337,7 @@ async def suggest_storage(
 async def get_component_score(
     request: Request,
     component_id: str,
-    target_tier: str = Query("mid-range", description="Target performance tier for scoring")
+    target_tier: Tier = Query("mid-range", description="Target performance tier for scoring")
 ):
     """
     Get detailed recommendation scores for a specific component.
@@ -283,40 +351,41 @@ async def get_component_score(
     
     **Rate Limit:** 100 requests/minute
     """
-    start_time = time.perf_counter()
-    
-    # Validate target tier
-    valid_tiers = ["budget", "mid-range", "high-end"]
-    if target_tier not in valid_tiers:
-        raise ValidationException(
-            message=f"Invalid tier. Must be one of: {valid_tiers}",
-            field="target_tier"
-        )
+    # Check cache
+    cache_key = f"score:{component_id}:{target_tier}"
+    cached_result = await cache.aget("suggestions", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        component = algolia_service.get_component_by_id(component_id)
+        component = await algolia_service.get_component_by_id(component_id)
         if not component:
             raise NotFoundException(resource="Component", identifier=component_id)
         
         component_type = component.get("type", "Unknown")
-        scores = ComponentScorer.calculate_total_score(component, component_type, target_tier)
+        scores = ComponentScorer.score(component, component_type, target_tier)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = {
+            "component_id": component_id,
+            "component_name": component.get("name"),
+            "component_type": component_type,
+            "target_tier": target_tier,
+            "total_score": scores["total"],
+            "score_breakdown": scores["breakdown"],
+            "scoring_weights": ComponentScorer.WEIGHTS,
+            "interpretation": _interpret_score(scores["total"])
+        }
         
-        return success_response(
-            data={
-                "component_id": component_id,
-                "component_name": component.get("name"),
-                "component_type": component_type,
-                "target_tier": target_tier,
-                "total_score": scores["total"],
-                "score_breakdown": scores["breakdown"],
-                "scoring_weights": ComponentScorer.WEIGHTS,
-                "interpretation": _interpret_score(scores["total"])
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+        # Cache the result
+        await cache.aset("suggestions", cache_key, data)
+        
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except (NotFoundException, ValidationException):
         raise
     except Exception as e:
@@ -336,21 +405,22 @@ def _interpret_score(score: float) -> dict:
         return {"rating": "Poor", "description": "Not recommended for this tier", "emoji": "❌"}
 
 
-@router.post("/batch-score")
+@router.post("/batch-score", dependencies=[Depends(ConcurrencyLimit("batch", 4))])
 @limiter.limit("20/minute")
 async def batch_score_components(
     request: Request,
     component_ids: List[str],
-    target_tier: str = Query("mid-range", description="Target performance tier")
+    target_tier: Tier = Query("mid-range", description="Target performance tier")
 ):
     """
     Score multiple components at once for comparison.
     
     Useful for quickly comparing options. Limited to 10 components.
     
-    **Rate Limit:** 20 requests/minute (expensive operation)
+    **Rate Limit:** 20 requests/minute, 4 in flight per client (expensive operation)
     """
-    start_time = time.perf_counter()
+    # Repeated IDs would only be scored again; drop them (keeping order) before validating
+    component_ids = list(dict.fromkeys(component_ids))
     
     if len(component_ids) > 10:
         raise ValidationException(
@@ -366,36 +436,33 @@ async def batch_score_components(
     
     try:
         results = []
-        for comp_id in component_ids:
-            component = algolia_service.get_component_by_id(comp_id)
-            if component:
-                component_type = component.get("type", "Unknown")
-                scores = ComponentScorer.calculate_total_score(component, component_type, target_tier)
-                results.append({
-                    "id": comp_id,
-                    "name": component.get("name"),
-                    "type": component_type,
-                    "price": component.get("price"),
-                    "total_score": scores["total"],
-                    "breakdown": scores["breakdown"],
-                    "interpretation": _interpret_score(scores["total"])
-                })
+        # One round trip; only found IDs come back, in request order
+        fetched = await algolia_service.get_components_by_ids(component_ids)
+        for comp_id, component in fetched.items():
+            component_type = component.get("type", "Unknown")
+            scores = ComponentScorer.score(component, component_type, target_tier)
+            results.append({
+                "id": comp_id,
+                "name": component.get("name"),
+                "type": component_type,
+                "price": component.get("price"),
+                "total_score": scores["total"],
+                "breakdown": scores["breakdown"],
+                "interpretation": _interpret_score(scores["total"])
+            })
         
         # Sort by score
         results.sort(key=lambda x: x["total_score"], reverse=True)
         
-        process_time = int((time.perf_counter() - start_time) * 1000)
-        
-        return success_response(
+        return ORJSONResponse(success_response(
             data={
                 "target_tier": target_tier,
                 "components": results,
                 "count": len(results),
                 "best_pick": results[0] if results else None
             },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
+            request_id=get_request_id()
+        ))
     except ValidationException:
         raise
     except Exception as e:
@@ -403,12 +470,126 @@ async def batch_score_components(
         raise AlgoliaException(operation="batch_score", message=str(e))
 
 
-@router.get("/preset/{preset_id}")
+# Build presets served by /preset/{preset_id}
+_PRESETS = {
+    "budget-gaming": {
+        "budget": 800,
+        "tier": "budget",
+        "description": "Great 1080p gaming under $800",
+        "target_resolution": "1080p",
+        "target_fps": "60+"
+    },
+    "mid-range-gaming": {
+        "budget": 1200,
+        "tier": "mid-range", 
+        "description": "Solid 1440p performance ~$1200",
+        "target_resolution": "1440p",
+        "target_fps": "60-144"
+    },
+    "high-end-gaming": {
+        "budget": 2500,
+        "tier": "high-end",
+        "description": "4K gaming & streaming $2000+",
+        "target_resolution": "4K",
+        "target_fps": "60-120"
+    },
+    "workstation": {
+        "budget": 3000,
+        "tier": "high-end",
+        "description": "Content creation & productivity",
+        "target_resolution": "Multi-monitor",
+        "use_case": "productivity"
+    }
+}
+
+# Share of a preset's budget given to each component category
+_BUDGET_SHARES = {
+    "CPU": 0.20,
+    "GPU": 0.35,
+    "Motherboard": 0.15,
+    "Memory": 0.10,
+    "Storage": 0.10,
+    "PSU": 0.10
+}
+
+# Expected system draw per preset tier, for PSU sizing
+_PRESET_POWER_ESTIMATES = {"budget": 350, "mid-range": 500, "high-end": 700}
+
+# Suggestions per category when the request doesn't set `limit`
+PRESET_DEFAULT_LIMIT = 3
+
+
+async def _suggest_for_preset(component_type: str, budget: float, tier: str, limit: int) -> List[Dict]:
+    """Top suggestions for one category of a build preset."""
+    if component_type == "CPU":
+        return await suggestion_service.suggest_cpus(budget=budget, limit=limit)
+    if component_type == "Storage":
+        return await suggestion_service.suggest_storage(budget=budget, limit=limit)
+    if component_type == "PSU":
+        return await suggestion_service.suggest_psu(_PRESET_POWER_ESTIMATES.get(tier, 500), limit=limit)
+    
+    results = await algolia_service.search_by_type(
+        component_type, filters={"price_range": {"min": 0, "max": budget}}, limit=limit * 2
+    )
+    for r in results:
+        r["recommendation_score"] = ComponentScorer.score(r, component_type, tier)["total"]
+    return heapq.nlargest(limit, results, key=lambda x: x["recommendation_score"])
+
+
+async def _build_preset(preset_id: str, preset: Dict, limit: int) -> Dict:
+    """Build a preset's suggestions and cache them if any searches succeeded."""
+    # Get suggested components for each category
+    budget_per_component = {
+        component_type: preset["budget"] * share for component_type, share in _BUDGET_SHARES.items()
+    }
+    
+    # Categories are independent, so their Algolia searches run concurrently
+    picks = await asyncio.gather(*(
+        _suggest_for_preset(component_type, budget, preset["tier"], limit)
+        for component_type, budget in budget_per_component.items()
+    ))
+    suggestions = dict(zip(budget_per_component, picks))
+    
+    # Calculate estimated total from top picks
+    total_estimated = sum(top[0].get("price", 0) for top in picks if top)
+    
+    data = {
+        "preset_id": preset_id,
+        "preset_info": preset,
+        "budget_allocation": budget_per_component,
+        "suggestions": suggestions,
+        "estimated_total": round(total_estimated, 2)
+    }
+    
+    # Cache the result (failed searches come back empty and aren't cached)
+    if any(suggestions.values()):
+        await cache.aset("presets", f"preset:{preset_id}:{limit}", data)
+    return data
+
+
+async def refresh_presets() -> None:
+    """
+    Rebuild every preset at the default limit shortly before its cached copy
+    expires, so preset requests are served from cache instead of paying for
+    six searches on a cold miss. Other limits are built on demand.
+    Run as a background task for the lifetime of the app.
+    """
+    interval = cache.ttl("presets") * 0.9
+    while True:
+        for preset_id, preset in _PRESETS.items():
+            try:
+                await _build_preset(preset_id, preset, PRESET_DEFAULT_LIMIT)
+            except Exception as e:
+                logger.warning(f"Preset refresh failed for {preset_id}: {e}")
+        await asyncio.sleep(interval)
+
+
+@router.get("/preset/{preset_id}", dependencies=[Depends(ConcurrencyLimit("preset", 8))])
 @limiter.limit("30/minute")
 async def get_preset_suggestions(
     request: Request,
-    preset_id: str,
-    limit: int = Query(3, ge=1, le=5)
+    preset_id: PresetId,
+    limit: int = Query(PRESET_DEFAULT_LIMIT, ge=1, le=5)
 ):
     """
     Get component suggestions for a build preset.
@@ -419,110 +600,26 @@ async def get_preset_suggestions(
     - **high-end-gaming**: 4K gaming & streaming $2000+
     - **workstation**: Content creation & productivity
     
-    **Rate Limit:** 30 requests/minute
+    **Rate Limit:** 30 requests/minute, 8 in flight per client
     """
-    start_time = time.perf_counter()
-    
-    presets = {
-        "budget-gaming": {
-            "budget": 800,
-            "tier": "budget",
-            "description": "Great 1080p gaming under $800",
-            "target_resolution": "1080p",
-            "target_fps": "60+"
-        },
-        "mid-range-gaming": {
-            "budget": 1200,
-            "tier": "mid-range", 
-            "description": "Solid 1440p performance ~$1200",
-            "target_resolution": "1440p",
-            "target_fps": "60-144"
-        },
-        "high-end-gaming": {
-            "budget": 2500,
-            "tier": "high-end",
-            "description": "4K gaming & streaming $2000+",
-            "target_resolution": "4K",
-            "target_fps": "60-120"
-        },
-        "workstation": {
-            "budget": 3000,
-            "tier": "high-end",
-            "description": "Content creation & productivity",
-            "target_resolution": "Multi-monitor",
-            "use_case": "productivity"
-        }
-    }
+    preset = _PRESETS[preset_id]
     
-    preset = presets.get(preset_id)
-    if not preset:
-        raise NotFoundException(
-            resource="Preset",
-            identifier=preset_id,
-            message=f"Available presets: {list(presets.keys())}"
-        )
+    # Check cache
+    cache_key = f"preset:{preset_id}:{limit}"
+    cached_result = await cache.aget("presets", cache_key)
+    if cached_result:
+        return ORJSONResponse(success_response(
+            data=cached_result,
+            request_id=get_request_id()
+        ))
     
     try:
-        # Get suggested components for each category
-        budget_per_component = {
-            "CPU": preset["budget"] * 0.20,
-            "GPU": preset["budget"] * 0.35,
-            "Motherboard": preset["budget"] * 0.15,
-            "Memory": preset["budget"] * 0.10,
-            "Storage": preset["budget"] * 0.10,
-            "PSU": preset["budget"] * 0.10
-        }
-        
-        suggestions = {}
-        total_estimated = 0
-        
-        for component_type, budget in budget_per_component.items():
-            if component_type == "CPU":
-                suggestions["CPU"] = suggestion_service.suggest_cpus(budget=budget, limit=limit)
-            elif component_type == "Memory":
-                results = algolia_service.search_by_type("Memory", filters={"price_range": {"min": 0, "max": budget}}, limit=limit * 2)
-                scored = []
-                for r in results:
-                    s = ComponentScorer.calculate_total_score(r, "Memory", preset["tier"])
-                    r["recommendation_score"] = s["total"]
-                    scored.append(r)
-                scored.sort(key=lambda x: x.get("recommendation_score", 0), reverse=True)
-                suggestions["Memory"] = scored[:limit]
-            elif component_type == "Storage":
-                suggestions["Storage"] = suggestion_service.suggest_storage(budget=budget, limit=limit)
-            elif component_type == "PSU":
-                power_estimates = {"budget": 350, "mid-range": 500, "high-end": 700}
-                suggestions["PSU"] = suggestion_service.suggest_psu(power_estimates.get(preset["tier"], 500), limit=limit)
-            else:
-                results = algolia_service.search_by_type(component_type, filters={"price_range": {"min": 0, "max": budget}}, limit=limit * 2)
-                scored = []
-                for r in results:
-                    s = ComponentScorer.calculate_total_score(r, component_type, preset["tier"])
-                    r["recommendation_score"] = s["total"]
-                    scored.append(r)
-                scored.sort(key=lambda x: x.get("recommendation_score", 0), reverse=True)
-                suggestions[component_type] = scored[:limit]
-            
-            # Calculate estimated total from top picks
-            if suggestions.get(component_type) and len(suggestions[component_type]) > 0:
-                top_pick = suggestions[component_type][0]
-                total_estimated += top_pick.get("price", 0)
-        
-        process_time = int((time.perf_counter() - start_time) * 1000)
+        data = await _build_preset(preset_id, preset, limit)
         
-        return success_response(
-            data={
-                "preset_id": preset_id,
-                "preset_info": preset,
-                "budget_allocation": budget_per_component,
-                "suggestions": suggestions,
-                "estimated_total": round(total_estimated, 2)
-            },
-            request_id=get_request_id(),
-            processing_time_ms=process_time
-        )
-    except NotFoundException:
-        raise
+        return ORJSONResponse(success_response(
+            data=data,
+            request_id=get_request_id()
+        ))
     except Exception as e:
         logger.error(f"Preset suggestions failed: {str(e)}")
         raise AlgoliaException(operation="preset_suggestions", message=str(e))
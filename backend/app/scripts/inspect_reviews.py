@@ -1,15 +1,19 @@
-import pandas as pd
+import fsspec
+import pyarrow.parquet as pq
 import sys
 
 try:
     print("Loading dataset...")
-    df = pd.read_parquet("hf://datasets/argilla/pc-components-reviews/data/train-00000-of-00001.parquet")
-    print("Dataset loaded successfully.")
-    print("\nColumns:")
-    print(df.columns.tolist())
-    print("\nSample Texts:")
-    for t in df['text'].head(5):
-        print(f"- {t[:200]}...") # Print first 200 chars
+    with fsspec.open("hf://datasets/argilla/pc-components-reviews/data/train-00000-of-00001.parquet", "rb") as f:
+        pf = pq.ParquetFile(f)
+        # Only the first batch of the text column is read, not the whole file
+        batch = next(pf.iter_batches(batch_size=5, columns=["text"]))
+        print("Dataset loaded successfully.")
+        print("\nColumns:")
+        print(pf.schema_arrow.names)
+        print("\nSample Texts:")
+        for t in batch.column("text").to_pylist():
+            print(f"- {t[:200]}...") # Print first 200 chars
 
 except Exception as e:
     print(f"Error: {e}")
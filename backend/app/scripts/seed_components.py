@@ -3,6 +3,8 @@ import csv
 import os
 import sys
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -23,41 +25,37 @@ COMPONENT_FILES = {
     'cpu-cooler.csv': 'CPU Cooler'
 }
 
+# Concurrent Algolia batch uploads; the admin API accepts a few parallel writes
+UPLOAD_WORKERS = 4
+
 DATASET_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'datasets' / 'csv'
 
+@lru_cache(maxsize=None)
 def generate_id(name: str, type: str) -> str:
-    """Generate stable ID using MD5"""
-    m = hashlib.md5(name.encode('utf-8'))
-    return f"{type.lower()}-{m.hexdigest()[:10]}"
+    """Generate stable ID from a 5-byte BLAKE2b digest (10 hex chars). Also used by seed_reviews.py"""
+    m = hashlib.blake2b(name.encode('utf-8'), digest_size=5)
+    return f"{type.lower()}-{m.hexdigest()}"
+
+# Known brands, checked in this order; paired with their upper-cased form for matching
+BRANDS = [
+    "AMD", "Intel", "NVIDIA", "ASUS", "MSI", "Gigabyte", "ASRock", 
+    "Corsair", "G.Skill", "Samsung", "Western Digital", "Seagate", 
+    "Crucial", "Kingston", "EVGA", "Thermaltake", "Cooler Master", 
+    "NZXT", "Lian Li", "Fractal Design", "Be Quiet", "Noctua",
+    "Deepcool", "Arctic", "Phanteks", "Seasonic", "Super Flower",
+    "Zotac", "Sapphire", "PowerColor", "XFX", "PNY", "Inno3D",
+    "TeamGroup", "ADATA", "Sabrent", "Lexar", "Silicon Power"
+]
+_BRAND_NEEDLES = [(brand.upper(), brand) for brand in BRANDS]
 
 def extract_brand(name: str) -> str:
     """Extract brand from component name"""
     if not name:
         return "Unknown"
     
-    # Common brands mapping
-    brands = [
-        "AMD", "Intel", "NVIDIA", "ASUS", "MSI", "Gigabyte", "ASRock", 
-        "Corsair", "G.Skill", "Samsung", "Western Digital", "Seagate", 
-        "Crucial", "Kingston", "EVGA", "Thermaltake", "Cooler Master", 
-        "NZXT", "Lian Li", "Fractal Design", "Be Quiet", "Noctua",
-        "Deepcool", "Arctic", "Phanteks", "Seasonic", "Super Flower",
-        "Zotac", "Sapphire", "PowerColor", "XFX", "PNY", "Inno3D",
-        "TeamGroup", "ADATA", "Sabrent", "Lexar", "Silicon Power"
-    ]
-    
     name_upper = name.upper()
-    for brand in brands:
-        if brand.upper() in name_upper:
-            # Handle special casing
-            if brand.upper() == "ASUS": return "ASUS"
-            if brand.upper() == "NVIDIA": return "NVIDIA"
-            if brand.upper() == "MSI": return "MSI"
-            if brand.upper() == "EVGA": return "EVGA"
-            if brand.upper() == "NZXT": return "NZXT"
-            if brand.upper() == "XFX": return "XFX"
-            if brand.upper() == "PNY": return "PNY"
-            if brand.upper() == "AMD": return "AMD"
+    for needle, brand in _BRAND_NEEDLES:
+        if needle in name_upper:
             return brand
             
     return name.split(' ')[0]
@@ -202,29 +200,39 @@ def main():
     print("Configuring Algolia index settings...")
     algolia_service.configure_index_settings()
     
-    all_components = []
+    # Index in batches of 1000. Each file's batches start uploading as soon as it is
+    # parsed, so uploads overlap parsing and only unsent components are kept around
+    batch_size = 1000
+    pending = []
+    uploads = []
+    total = 0
     
-    for filename, component_type in COMPONENT_FILES.items():
-        components = process_file(filename, component_type)
-        all_components.extend(components)
-        print(f"Found {len(components)} {component_type}s")
+    # Files are independent, so parse them in parallel processes (past the GIL);
+    # map() keeps results in COMPONENT_FILES order
+    with ProcessPoolExecutor(max_workers=min(len(COMPONENT_FILES), os.cpu_count() or 1)) as parser, \
+            ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as uploader:
+        results = parser.map(process_file, COMPONENT_FILES.keys(), COMPONENT_FILES.values())
+        for component_type, components in zip(COMPONENT_FILES.values(), results):
+            print(f"Found {len(components)} {component_type}s")
+            total += len(components)
+            pending.extend(components)
+            while len(pending) >= batch_size:
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                uploads.append((len(batch), uploader.submit(algolia_service.index_components, batch)))
+        if pending:
+            uploads.append((len(pending), uploader.submit(algolia_service.index_components, pending)))
         
-    if not all_components:
-        print("No components found to seed.")
-        return
+        if not uploads:
+            print("No components found to seed.")
+            return
         
-    print(f"Total components to index: {len(all_components)}")
-    
-    # Index in batches of 1000
-    batch_size = 1000
-    for i in range(0, len(all_components), batch_size):
-        batch = all_components[i:i+batch_size]
-        print(f"Indexing batch {i//batch_size + 1} ({len(batch)} items)...")
-        result = algolia_service.index_components(batch)
-        if result.get('success'):
-            print("Batch indexed successfully.")
-        else:
-            print(f"Error indexing batch: {result.get('error')}")
+        print(f"Total components to index: {total} in {len(uploads)} batches")
+        for number, (size, upload) in enumerate(uploads, 1):
+            result = upload.result()
+            if result.get('success'):
+                print(f"Batch {number} ({size} items) indexed successfully.")
+            else:
+                print(f"Error indexing batch {number}: {result.get('error')}")
             
     print("Seeding completed!")
 
@@ -1,15 +1,21 @@
-import hashlib
 import pandas as pd
 import os
 import sys
-import csv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; without it every name is tested against every review
+    ahocorasick = None
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from app.services.algolia_service import algolia_service
+# Review IDs must match the indexed components
+from app.scripts.seed_components import generate_id, UPLOAD_WORKERS
 
 # Reuse configuration
 COMPONENT_FILES = {
@@ -25,11 +31,6 @@ COMPONENT_FILES = {
 
 DATASET_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'datasets' / 'csv'
 
-def generate_id(name: str, type: str) -> str:
-    """Generate stable ID using MD5 - MUST MATCH seed_components.py"""
-    m = hashlib.md5(name.encode('utf-8'))
-    return f"{type.lower()}-{m.hexdigest()[:10]}"
-
 def load_component_map() -> Dict[str, Dict]:
     """Load all component names and IDs"""
     print("Loading component map...")
@@ -40,20 +41,48 @@ def load_component_map() -> Dict[str, Dict]:
         if not file_path.exists(): continue
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    name = row.get('name', '')
-                    if name:
-                        comp_id = generate_id(name, component_type)
-                        # Store lower case name for easier matching
-                        comp_map[name] = {"id": comp_id, "type": component_type, "real_name": name}
+            # Only names are needed, so parse just that column (in C)
+            names = pd.read_csv(file_path, usecols=['name'], dtype=str, keep_default_na=False, encoding='utf-8')['name']
+            for name in names:
+                if name:
+                    comp_id = generate_id(name, component_type)
+                    # Store lower case name for easier matching
+                    comp_map[name] = {"id": comp_id, "type": component_type, "real_name": name}
         except Exception: 
             pass
             
     print(f"Loaded {len(comp_map)} components to match against.")
     return comp_map
 
+def build_name_matcher(names: List[str]) -> Callable[[str], Optional[str]]:
+    """
+    Build a matcher returning the first of `names` (in priority order) found in a
+    lower-cased text, or None. With pyahocorasick installed, each text is scanned
+    once for all names instead of once per name.
+    """
+    lowered = [(name.lower(), name) for name in names]
+    
+    # An automaton with no words can't be searched, so use the plain loop then too
+    if ahocorasick is None or not lowered:
+        def match(text_lower: str) -> Optional[str]:
+            for needle, name in lowered:
+                if needle in text_lower:
+                    return name
+            return None
+        return match
+    
+    automaton = ahocorasick.Automaton()
+    for rank, (needle, name) in enumerate(lowered):
+        # Names equal ignoring case keep the higher-priority one
+        if needle not in automaton:
+            automaton.add_word(needle, (rank, name))
+    automaton.make_automaton()
+    
+    def match(text_lower: str) -> Optional[str]:
+        best = min((payload for _, payload in automaton.iter(text_lower)), default=None)
+        return best[1] if best else None
+    return match
+
 def main():
     print("Starting review seeding...")
     
@@ -73,6 +102,7 @@ def main():
     # Sort names by length descending to match longest specific name first
     # e.g. match "Ryzen 7 5800X" before "Ryzen 7"
     sorted_names = sorted(comp_map.keys(), key=len, reverse=True)
+    match_name = build_name_matcher(sorted_names)
     
     # 3. Match reviews
     updates = {} # ID -> list of reviews
@@ -89,11 +119,7 @@ def main():
         # Let's do case insensitive for better hit rate
         text_lower = text.lower()
         
-        match_found = None
-        for name in sorted_names:
-            if name.lower() in text_lower:
-                match_found = name
-                break # taking longest match
+        match_found = match_name(text_lower) # longest match
         
         if match_found:
             comp_data = comp_map[match_found]
@@ -133,16 +159,15 @@ def main():
         
     print(f"Sending {len(algolia_payload)} updates to Algolia...")
     
-    # Batch update
+    # Batch update, several uploads in flight at once
     batch_size = 1000
-    for i in range(0, len(algolia_payload), batch_size):
-        batch = algolia_payload[i:i+batch_size]
-        print(f"Updating batch {i//batch_size + 1}...")
-        res = algolia_service.partial_update_components(batch)
-        if res.get('success'):
-            print("Batch updated.")
-        else:
-            print(f"Error: {res.get('error')}")
+    batches = [algolia_payload[i:i+batch_size] for i in range(0, len(algolia_payload), batch_size)]
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        for number, res in enumerate(executor.map(algolia_service.partial_update_components, batches), 1):
+            if res.get('success'):
+                print(f"Batch {number} updated.")
+            else:
+                print(f"Error in batch {number}: {res.get('error')}")
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,24 @@
-from algoliasearch.search.client import SearchClientSync
+from algoliasearch.search.client import SearchClient, SearchClientSync
 from typing import List, Dict, Any, Optional, Union
+import asyncio
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Sort option -> criteria placed ahead of the default ranking on its replica index
+REPLICA_SORTS = {
+    "price_asc": ["asc(price)"],
+    "price_desc": ["desc(price)"],
+    "popular": ["desc(recommendation_score)", "desc(rating.average)"],
+}
+DEFAULT_RANKING = ["typo", "geo", "words", "filters", "proximity", "attribute", "exact", "custom"]
+
+# Single-ID lookups arriving within this window share one get_objects call
+ID_BATCH_WINDOW = float(os.getenv("ALGOLIA_ID_BATCH_WINDOW_MS", 5)) / 1000
+# A batch is sent early once this many distinct IDs are waiting
+ID_BATCH_SIZE = 100
+
 class AlgoliaService:
     """Service for interacting with Algolia search"""
     
@@ -17,8 +31,17 @@ class AlgoliaService:
             raise ValueError("Missing Algolia credentials in environment variables")
         
         self.admin_client = SearchClientSync(self.app_id, self.admin_api_key)
-        self.search_client = SearchClientSync(self.app_id, self.search_api_key)
+        # Async client for all reads, so handlers never block the event loop;
+        # its connection pool opens on first use
+        self.async_search_client = SearchClient(self.app_id, self.search_api_key)
         self.index_name = "pc_components"
+        # Standard replicas ranked by a fixed order, so sorted results come back pre-sorted and paginate correctly
+        self.sort_replicas = {sort_by: f"{self.index_name}_{sort_by}" for sort_by in REPLICA_SORTS}
+        
+        # Coalesced single-ID lookups: ID -> future shared by everyone waiting on it
+        self._pending_ids: Dict[str, asyncio.Future] = {}
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
     
     def _extract_search_result(self, response: Any) -> Any:
         """Extract actual search result from Algolia v4 API response wrapper"""
@@ -28,6 +51,11 @@ class AlgoliaService:
         result = response.results[0]
         return getattr(result, 'actual_instance', result)
     
+    @staticmethod
+    def _hits(result: Any) -> List[Dict[str, Any]]:
+        """Search hits as plain dicts, so they can be annotated, cached and serialized."""
+        return [hit.to_dict() for hit in getattr(result, 'hits', None) or []]
+    
     def _build_filters(self, filters: Optional[Dict[str, Any]] = None) -> tuple:
         """Build facet and numeric filters from filter dictionary"""
         facet_filters = []
@@ -52,12 +80,13 @@ class AlgoliaService:
         
         return facet_filters, numeric_filters
     
-    def search_components(
+    async def search_components(
         self,
         query: str,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        sort_by: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Search components using Algolia
@@ -67,6 +96,7 @@ class AlgoliaService:
             filters: Dictionary with filter criteria (type, brand, price_range, etc.)
             limit: Maximum results to return
             offset: Pagination offset
+            sort_by: Optional sort ("price_asc", "price_desc", "popular") served by a replica
             
         Returns:
             Search results with hits, facets, and metadata
@@ -74,10 +104,10 @@ class AlgoliaService:
         facet_filters, numeric_filters = self._build_filters(filters)
         
         try:
-            response = self.search_client.search(
+            response = await self.async_search_client.search(
                 search_method_params={
                     "requests": [{
-                        "indexName": self.index_name,
+                        "indexName": self.sort_replicas.get(sort_by, self.index_name),
                         "query": query,
                         "hitsPerPage": limit,
                         "page": offset // limit,
@@ -95,7 +125,7 @@ class AlgoliaService:
                 return {"hits": [], "nbHits": 0}
             
             return {
-                "hits": getattr(result, 'hits', []),
+                "hits": self._hits(result),
                 "nbHits": getattr(result, 'nb_hits', 0),
                 "page": getattr(result, 'page', 0),
                 "nbPages": getattr(result, 'nb_pages', 0),
@@ -107,11 +137,13 @@ class AlgoliaService:
             print(f"Algolia search error: {e}")
             return {"hits": [], "nbHits": 0, "error": str(e)}
     
-    def search_by_type(
+    async def search_by_type(
         self,
         component_type: str,
         filters: Optional[Dict[str, Any]] = None,
-        limit: int = 50
+        limit: int = 50,
+        sort_by: Optional[str] = None,
+        raise_errors: bool = False
     ) -> List[Any]:
         """
         Search components by type (CPU, GPU, etc.)
@@ -120,6 +152,9 @@ class AlgoliaService:
             component_type: Component type to filter by (CPU, GPU, Motherboard, etc.)
             filters: Additional filters (socket, brand, performance_tier, price_range)
             limit: Maximum results
+            sort_by: Optional sort ("price_asc", "price_desc", "popular") served by a replica
+            raise_errors: Re-raise Algolia errors instead of returning an empty list,
+                so callers can tell a failure from no matches
             
         Returns:
             List of matching components
@@ -132,10 +167,10 @@ class AlgoliaService:
         facet_filters, numeric_filters = self._build_filters(type_filters)
         
         try:
-            response = self.search_client.search(
+            response = await self.async_search_client.search(
                 search_method_params={
                     "requests": [{
-                        "indexName": self.index_name,
+                        "indexName": self.sort_replicas.get(sort_by, self.index_name),
                         "query": "",
                         "facetFilters": facet_filters,
                         "numericFilters": numeric_filters,
@@ -146,43 +181,143 @@ class AlgoliaService:
             )
             
             result = self._extract_search_result(response)
-            return getattr(result, 'hits', []) if result else []
+            return self._hits(result) if result else []
         except Exception as e:
             print(f"Algolia search by type error: {e}")
+            if raise_errors:
+                raise
             return []
     
-    def get_component_by_id(self, component_id: str) -> Optional[Any]:
+    async def get_component_by_id(self, component_id: str) -> Optional[Any]:
         """
         Get a single component by ID
         
+        Concurrent lookups are queued for a few milliseconds and fetched
+        together in one get_objects request; callers asking for the same ID
+        share its result.
+        
         Args:
             component_id: Unique component identifier (objectID)
             
         Returns:
             Component data or None if not found
         """
+        future = self._pending_ids.get(component_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending_ids[component_id] = loop.create_future()
+            if len(self._pending_ids) >= ID_BATCH_SIZE:
+                self._flush_pending_ids()
+            elif self._flush_timer is None:
+                self._flush_timer = loop.call_later(ID_BATCH_WINDOW, self._flush_pending_ids)
+        
+        # Shielded so one cancelled caller doesn't cancel the lookup for the others
+        return await asyncio.shield(future)
+    
+    def _flush_pending_ids(self) -> None:
+        """Send every queued ID lookup as one batch."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        
+        pending, self._pending_ids = self._pending_ids, {}
+        if pending:
+            task = asyncio.ensure_future(self._fetch_pending_ids(pending))
+            # Hold a reference until done so the task isn't garbage collected
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._end_batch)
+    
+    def _end_batch(self, task: asyncio.Task) -> None:
+        """Drop a finished batch task; its callers have already been given any error."""
+        self._batch_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch_pending_ids(self, pending: Dict[str, asyncio.Future]) -> None:
+        """Fetch a batch of queued IDs and resolve their futures."""
         try:
-            response = self.search_client.search(
+            components = await self.get_components_by_ids(list(pending))
+        except BaseException as e:
+            # Fail the waiting callers rather than leave them blocked (e.g. cancelled at shutdown)
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved when nobody is waiting
+            raise
+        for component_id, future in pending.items():
+            if not future.done():
+                future.set_result(components.get(component_id))
+    
+    async def get_components_by_ids(
+        self,
+        component_ids: List[str],
+        attributes: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get several components by ID in a single request
+        
+        Args:
+            component_ids: Component identifiers (objectIDs); duplicates are fetched once
+            attributes: Only retrieve these record attributes (default: all)
+            
+        Returns:
+            Dictionary mapping each found ID to its component data
+        """
+        unique_ids = list(dict.fromkeys(component_ids))
+        if not unique_ids:
+            return {}
+        
+        request = {"indexName": self.index_name}
+        if attributes:
+            request["attributesToRetrieve"] = attributes
+        
+        try:
+            response = await self.async_search_client.get_objects(
+                get_objects_params={
+                    "requests": [{**request, "objectID": component_id} for component_id in unique_ids]
+                }
+            )
+            
+            # Records come back in request order, with None for missing IDs
+            results = getattr(response, 'results', None) or []
+            return {
+                component_id: component
+                for component_id, component in zip(unique_ids, results)
+                if component
+            }
+        except Exception as e:
+            print(f"Error fetching components by ID: {e}")
+            return {}
+    
+    async def warm_up(self) -> bool:
+        """
+        Open the async client's pooled connection (DNS, TCP, TLS) before the
+        first request needs it, using an empty search that records no analytics.
+        
+        Returns:
+            True if Algolia answered
+        """
+        try:
+            await self.async_search_client.search(
                 search_method_params={
                     "requests": [{
                         "indexName": self.index_name,
                         "query": "",
-                        "filters": f"objectID:{component_id}",
-                        "hitsPerPage": 1
+                        "hitsPerPage": 0,
+                        "analytics": False
                     }]
                 }
             )
-            
-            result = self._extract_search_result(response)
-            if result:
-                hits = getattr(result, 'hits', [])
-                return hits[0] if hits else None
-            return None
+            return True
         except Exception as e:
-            print(f"Error fetching component by ID: {e}")
-            return None
+            print(f"Algolia warm-up failed: {e}")
+            return False
     
-    def get_facets(self, component_type: Optional[str] = None) -> Dict[str, Any]:
+    async def close(self) -> None:
+        """Close the async client's connection pool."""
+        await self.async_search_client.close()
+    
+    async def get_facets(self, component_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Get available facet values for filtering UI dropdowns
         
@@ -196,7 +331,7 @@ class AlgoliaService:
         facet_filters = [f"type:{component_type}"] if component_type else []
         
         try:
-            response = self.search_client.search(
+            response = await self.async_search_client.search(
                 search_method_params={
                     "requests": [{
                         "indexName": self.index_name,
@@ -345,13 +480,21 @@ class AlgoliaService:
         try:
             response = self.admin_client.set_settings(
                 index_name=self.index_name,
-                index_settings=settings
+                index_settings={**settings, "replicas": list(self.sort_replicas.values())}
             )
             
             task_id = getattr(response, 'task_id', None)
             if not task_id and isinstance(response, dict):
                 task_id = response.get("taskID")
             
+            # Replicas exist once the primary's settings task completes; rank each by its sort first
+            self.admin_client.wait_for_task(index_name=self.index_name, task_id=task_id)
+            for sort_by, replica in self.sort_replicas.items():
+                self.admin_client.set_settings(
+                    index_name=replica,
+                    index_settings={**settings, "ranking": REPLICA_SORTS[sort_by] + DEFAULT_RANKING}
+                )
+            
             return {"success": True, "taskID": task_id}
         except Exception as e:
             print(f"Error configuring index settings: {e}")
@@ -1,5 +1,8 @@
 from typing import Dict, List, Tuple, Optional
 
+# Record attributes the checks read (plus name/type for responses); fetch only these
+COMPATIBILITY_ATTRIBUTES = ["name", "type", "specs", "socket", "memory_type", "form_factor", "tdp", "wattage"]
+
 class CompatibilityService:
     """Service for checking component compatibility"""
     
@@ -1,5 +1,7 @@
 from app.services.algolia_service import algolia_service
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple
+import heapq
 import re
 from datetime import datetime
 
@@ -236,13 +238,60 @@ class ComponentScorer:
             'total': round(total, 1),
             'breakdown': {k: round(v, 1) for k, v in scores.items()}
         }
+    
+    @classmethod
+    def score(cls, component: Dict, component_type: str, target_tier: str = 'mid-range') -> Dict:
+        """
+        `calculate_total_score`, memoized on the fields the scorers read.
+        
+        The same components are scored over and over by the suggestion and
+        preset endpoints; keying on their scored fields (not just objectID)
+        means a re-indexed price or rating is never served a stale score.
+        """
+        try:
+            total, breakdown = _score_cached(_ScoringKey(component), component_type, target_tier)
+        except TypeError:
+            # Unhashable field values (unexpected shapes); score directly
+            return cls.calculate_total_score(component, component_type, target_tier)
+        return {'total': total, 'breakdown': dict(breakdown)}
+
+
+class _ScoringKey:
+    """Hashable stand-in for a component, equal to any component with the same scored fields."""
+    
+    __slots__ = ('component', 'fingerprint', '_hash')
+    
+    def __init__(self, component: Dict):
+        specs = component.get('specs') or {}
+        rating = component.get('rating')
+        self.component = component
+        self.fingerprint: Tuple[Any, ...] = (
+            component.get('name'), component.get('price'), component.get('performance_tier'),
+            (rating.get('average'), rating.get('count')) if isinstance(rating, dict) else None,
+            component.get('average_rating'), component.get('review_count'),
+            component.get('tdp'), component.get('socket'),
+            specs.get('tdp'), specs.get('core_count'), specs.get('socket'), specs.get('memory_type'),
+        )
+        self._hash = hash(self.fingerprint)
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ScoringKey) and self.fingerprint == other.fingerprint
+
+
+@lru_cache(maxsize=4096)
+def _score_cached(key: _ScoringKey, component_type: str, target_tier: str) -> Tuple[float, Tuple]:
+    scores = ComponentScorer.calculate_total_score(key.component, component_type, target_tier)
+    return scores['total'], tuple(scores['breakdown'].items())
 
 
 class SuggestionService:
     """Service for suggesting compatible components with intelligent scoring"""
     
     @staticmethod
-    def suggest_cpus(
+    async def suggest_cpus(
         budget: Optional[float] = None,
         use_case: Optional[str] = None,
         limit: int = 10
@@ -263,7 +312,7 @@ class SuggestionService:
         if budget:
             filters["price_range"] = {"min": 0, "max": budget}
         
-        results = algolia_service.search_by_type("CPU", filters=filters, limit=limit * 3)
+        results = await algolia_service.search_by_type("CPU", filters=filters, limit=limit * 3)
         
         # Determine target tier based on budget and use case
         target_tier = 'mid-range'
@@ -279,18 +328,16 @@ class SuggestionService:
         # Score and sort results
         scored_results = []
         for cpu in results:
-            scores = ComponentScorer.calculate_total_score(cpu, 'CPU', target_tier)
+            scores = ComponentScorer.score(cpu, 'CPU', target_tier)
             cpu['recommendation_score'] = scores['total']
             cpu['score_breakdown'] = scores['breakdown']
             scored_results.append(cpu)
         
-        # Sort by recommendation score
-        scored_results.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return scored_results[:limit]
+        # Top picks by recommendation score (partial selection, no full sort)
+        return heapq.nlargest(limit, scored_results, key=lambda x: x['recommendation_score'])
     
     @staticmethod
-    def suggest_compatible_gpu(
+    async def suggest_compatible_gpu(
         cpu: Dict,
         budget: Optional[float] = None,
         limit: int = 5
@@ -325,7 +372,7 @@ class SuggestionService:
             filters["price_range"] = {"min": 0, "max": budget}
         
         # Search GPUs
-        all_results = algolia_service.search_by_type("GPU", filters=filters, limit=50)
+        all_results = await algolia_service.search_by_type("GPU", filters=filters, limit=50)
         
         # Filter by performance tier
         matched_results = [
@@ -336,18 +383,16 @@ class SuggestionService:
         # Score results
         scored_results = []
         for gpu in matched_results:
-            scores = ComponentScorer.calculate_total_score(gpu, 'GPU', target_tier)
+            scores = ComponentScorer.score(gpu, 'GPU', target_tier)
             gpu['recommendation_score'] = scores['total']
             gpu['score_breakdown'] = scores['breakdown']
             scored_results.append(gpu)
         
-        # Sort by recommendation score
-        scored_results.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return scored_results[:limit]
+        # Top picks by recommendation score (partial selection, no full sort)
+        return heapq.nlargest(limit, scored_results, key=lambda x: x['recommendation_score'])
     
     @staticmethod
-    def suggest_compatible_motherboard(cpu: Dict, limit: int = 5) -> List[Dict]:
+    async def suggest_compatible_motherboard(cpu: Dict, limit: int = 5) -> List[Dict]:
         """
         Suggest motherboards compatible with CPU socket using multi-factor scoring.
         
@@ -366,23 +411,21 @@ class SuggestionService:
             return []
         
         filters = {"socket": cpu_socket}
-        results = algolia_service.search_by_type("Motherboard", filters=filters, limit=limit * 3)
+        results = await algolia_service.search_by_type("Motherboard", filters=filters, limit=limit * 3)
         
         # Score results
         scored_results = []
         for mb in results:
-            scores = ComponentScorer.calculate_total_score(mb, 'Motherboard', cpu_tier)
+            scores = ComponentScorer.score(mb, 'Motherboard', cpu_tier)
             mb['recommendation_score'] = scores['total']
             mb['score_breakdown'] = scores['breakdown']
             scored_results.append(mb)
         
-        # Sort by recommendation score
-        scored_results.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return scored_results[:limit]
+        # Top picks by recommendation score (partial selection, no full sort)
+        return heapq.nlargest(limit, scored_results, key=lambda x: x['recommendation_score'])
     
     @staticmethod
-    def suggest_ram(
+    async def suggest_ram(
         motherboard: Dict,
         budget: Optional[float] = None,
         limit: int = 5
@@ -410,7 +453,7 @@ class SuggestionService:
             filters["price_range"] = {"min": 0, "max": budget}
         
         # Search Memory
-        results = algolia_service.search_by_type("Memory", filters=filters, limit=50)
+        results = await algolia_service.search_by_type("Memory", filters=filters, limit=50)
         
         # Filter by DDR type
         matched = [
@@ -421,18 +464,16 @@ class SuggestionService:
         # Score results
         scored_results = []
         for ram in matched:
-            scores = ComponentScorer.calculate_total_score(ram, 'Memory', mb_tier)
+            scores = ComponentScorer.score(ram, 'Memory', mb_tier)
             ram['recommendation_score'] = scores['total']
             ram['score_breakdown'] = scores['breakdown']
             scored_results.append(ram)
         
-        # Sort by recommendation score
-        scored_results.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return scored_results[:limit]
+        # Top picks by recommendation score (partial selection, no full sort)
+        return heapq.nlargest(limit, scored_results, key=lambda x: x['recommendation_score'])
     
     @staticmethod
-    def suggest_psu(total_power: int, limit: int = 5) -> List[Dict]:
+    async def suggest_psu(total_power: int, limit: int = 5) -> List[Dict]:
         """
         Suggest PSU with 1.25x headroom over total power
         
@@ -446,7 +487,7 @@ class SuggestionService:
         recommended_wattage = int(total_power * 1.25)
         
         # Search all PSUs
-        results = algolia_service.search_by_type("Power Supply", limit=100)
+        results = await algolia_service.search_by_type("Power Supply", limit=100)
         
         # Extract wattage from name (e.g., "Corsair RM1000x" -> 1000)
         def extract_wattage(psu: Dict) -> int:
@@ -477,7 +518,7 @@ class SuggestionService:
         return suitable_psus[:limit]
     
     @staticmethod
-    def suggest_storage(
+    async def suggest_storage(
         budget: Optional[float] = None,
         capacity_gb: Optional[int] = None,
         limit: int = 5
@@ -498,7 +539,7 @@ class SuggestionService:
             filters["price_range"] = {"min": 0, "max": budget}
         
         # Search internal hard drives and SSDs
-        results = algolia_service.search_by_type("Internal Hard Drive", filters=filters, limit=limit * 2)
+        results = await algolia_service.search_by_type("Internal Hard Drive", filters=filters, limit=limit * 2)
         
         # Prioritize SSDs
         results.sort(key=lambda x: (